@@ -1,5 +1,6 @@
 import plotly
-from typing import Tuple, Union
+import numpy as np
+from typing import List, Tuple, Union
 from palettable.cartocolors.cartocolorspalette import CartoColorsMap
 from colorsys import rgb_to_hsv, rgb_to_hls, hsv_to_rgb, hls_to_rgb
 
@@ -92,6 +93,57 @@ class ColorRGB:
         r, g, b = [int(255 * c) for c in hls_to_rgb(h, l, s)]
         return r, g, b
 
+    def get_shades(self, levels, reversed=True) -> List[Tuple[int, int, int]]:
+        """
+        Generates all the shades of the saturated color saved in the object for a given number
+        of levels. The shades are identical to the ones returned by get_shade but are computed
+        at once operating on the whole luminance array.
+
+        Arguments
+        ---------
+            levels : int
+                the number of shade levels expected
+            reversed : bool
+                if set to True the color will be lighter the higher the value of index else
+                the color will be darker for higher values of index
+
+        Returns
+        -------
+            List[Tuple[int, int, int]]
+                the list of red, green and blue values associated to each shade level
+        """
+        r, g, b = self.saturate()
+        h, _, s = rgb_to_hls(r / 255.0, g / 255.0, b / 255.0)
+
+        index = np.arange(levels)
+        if reversed:
+            l = 0.4 + 0.5 * (index / (levels + 1))
+        else:
+            l = 0.9 - 0.5 * (index / (levels + 1))
+
+        # Apply the HLS to RGB conversion (see colorsys.hls_to_rgb) to the luminance array. Since
+        # hue and saturation are fixed only the m1 and m2 coefficients depend on the level
+        if s == 0.0:
+            channels = [l, l, l]
+        else:
+            m2 = np.where(l <= 0.5, l * (1.0 + s), l + s - (l * s))
+            m1 = 2.0 * l - m2
+
+            channels = []
+            for hue in [h + 1.0 / 3.0, h, h - 1.0 / 3.0]:
+                hue = hue % 1.0
+                if hue < 1.0 / 6.0:
+                    channels.append(m1 + (m2 - m1) * hue * 6.0)
+                elif hue < 0.5:
+                    channels.append(m2)
+                elif hue < 2.0 / 3.0:
+                    channels.append(m1 + (m2 - m1) * (2.0 / 3.0 - hue) * 6.0)
+                else:
+                    channels.append(m1)
+
+        shades = (255 * np.stack(channels, axis=1)).astype(int)
+        return [tuple(shade) for shade in shades.tolist()]
+
 
 def get_basecolor(palette: CartoColorsMap, index: int) -> ColorRGB:
     """
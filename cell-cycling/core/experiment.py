@@ -1,5 +1,7 @@
 from __future__ import annotations
+import numpy as np
 import streamlit as st
+from dataclasses import dataclass
 from io import BytesIO
 from os.path import splitext
 from typing import List, Tuple
@@ -15,6 +17,55 @@ if "__EXPERIMENT_INIT_COUNTER__" not in st.session_state:
         st.session_state["__EXPERIMENT_INIT_COUNTER__"] = 0
 
 
+@dataclass
+class CyclingAggregates:
+    """
+    Per-cycle aggregated quantities of the discharge halfcycles of a cellcycling object stored
+    as parallel arrays (one element for each visible cycle).
+
+    Attributes
+    ----------
+        total_energy : np.ndarray
+            the total energy of each discharge halfcycle in mWh
+        capacity : np.ndarray
+            the capacity of each discharge halfcycle in mAh
+        average_power : np.ndarray
+            the average power of each discharge halfcycle in W
+    """
+
+    total_energy: np.ndarray
+    capacity: np.ndarray
+    average_power: np.ndarray
+
+    @classmethod
+    def from_cellcycling(cls, cellcycling: CellCycling) -> CyclingAggregates:
+        """
+        Computes all the aggregated quantities with a single pass over the cycles
+
+        Arguments
+        ---------
+            cellcycling : CellCycling
+                the cellcycling object from which the quantities must be computed
+
+        Returns
+        -------
+            CyclingAggregates
+                the object containing the aggregated quantities
+        """
+        total_energy, capacity, average_power = [], [], []
+        for cycle in cellcycling:
+            discharge = cycle.discharge
+            total_energy.append(discharge.total_energy)
+            capacity.append(discharge.capacity)
+            average_power.append(discharge.power.mean())
+
+        return cls(
+            np.array(total_energy, dtype=float),
+            np.array(capacity, dtype=float),
+            np.array(average_power, dtype=float),
+        )
+
+
 class Experiment:
     """
     Class devoted to describe an experiment and its properties in the GUI.
@@ -92,7 +143,9 @@ class Experiment:
 
         # Create a buffer for the cycle based objects
         self._cycles = None
+        self._cycle_numbers = None
         self._cellcycling = None
+        self._aggregates = None
         self._update_cycles_based_objects()
 
         # Get univocal ID based on the number of object constructed
@@ -112,8 +165,10 @@ class Experiment:
 
     def _update_cycles_based_objects(self) -> None:
         self._cycles = self._manager.get_cycles(self._ordering, self._clean)
+        self._cycle_numbers = [cycle.number for cycle in self._cycles]
         self._cellcycling = CellCycling(self._cycles)
         self._cellcycling.hide(self._manual_hide)
+        self._aggregates = None
 
     def __iadd__(self, source: Experiment):
         """
@@ -179,6 +234,18 @@ class Experiment:
         self._manual_hide.append(index)
         self._update_cycles_based_objects()
 
+    def hide_cycles(self, indices: List[int]) -> None:
+        """
+        Hide a set of cycles updating the cycles based objects only once
+
+        Arguments
+        ---------
+            indices : List[int]
+                the numbers of the cycles to hide
+        """
+        self._manual_hide.extend(indices)
+        self._update_cycles_based_objects()
+
     def unhide_all_cycles(self) -> None:
         self._manual_hide = []
         self._update_cycles_based_objects()
@@ -310,6 +377,15 @@ class Experiment:
         """
         return [cycle for cycle in self._cycles if cycle._hidden is False]
 
+    @property
+    def cycle_numbers(self) -> List[int]:
+        """
+        getter of the list of numbers associated to all the cycles (hidden ones included)
+        """
+        if getattr(self, "_cycle_numbers", None) is None:
+            self._cycle_numbers = [cycle.number for cycle in self._cycles]
+        return self._cycle_numbers
+
     @property
     def cellcycling(self) -> CellCycling:
         """
@@ -317,6 +393,16 @@ class Experiment:
         """
         return self._cellcycling
 
+    @property
+    def aggregates(self) -> CyclingAggregates:
+        """
+        getter of the per-cycle aggregated quantities of the cellcycling object (computed on
+        first access and discarded every time the cycles are updated)
+        """
+        if getattr(self, "_aggregates", None) is None:
+            self._aggregates = CyclingAggregates.from_cellcycling(self._cellcycling)
+        return self._aggregates
+
 
 # Define an Experiment container to hold all the experiments related to a single multi-parameter
 # cycling experiment
@@ -347,10 +433,11 @@ class ExperimentContainer:
         return [exp.name for exp in self]
     
     def get_index_from_name(self, name:str) -> int:
-        if name not in self.get_experiment_names:
+        names = self.get_experiment_names
+        if name not in names:
             raise ValueError
             
-        return self.get_experiment_names.index(name)
+        return names.index(name)
 
     @property
     def hex_color(self) -> str:
@@ -388,32 +475,65 @@ class ExperimentContainer:
             raise RuntimeError
 
     def remove_experiment(self, name: str) -> None:
-        if name in [obj.name for obj in self._experiments]:
-            id = [obj.name for obj in self._experiments].index(name)
+        names = self.get_experiment_names
+        if name in names:
+            id = names.index(name)
             del self._experiments[id]
             self._update_capacity_retention()
         else:
             raise ValueError
 
+    def remove_experiments(self, names: List[str]) -> None:
+        """
+        Remove a set of experiments from the container in a single pass updating the capacity
+        retention only once
+
+        Arguments
+        ---------
+            names : List[str]
+                the names of the experiments to remove
+        """
+        names = set(names)
+        if not names.issubset(self.get_experiment_names):
+            raise ValueError
+
+        self._experiments = [exp for exp in self._experiments if exp.name not in names]
+
+        if self._experiments != []:
+            self._update_capacity_retention()
+        else:
+            self._capacity_retention = []
+
     def clear_experiments(self) -> None:
         self._experiments = {}
 
     def hide_cycle(self, cumulative_id: int) -> None:
-        cumulative_sum = []
-        for i, number in enumerate(self.max_cycles_numbers):
-            cumulative_sum.append(number if i == 0 else cumulative_sum[-1] + number + 1)
-
-        experiment_id, cycle_id = None, None
-        for i, threshold in enumerate(cumulative_sum):
-            if cumulative_id <= threshold:
-                experiment_id = i
-                if i == 0:
-                    cycle_id = cumulative_id
-                else:
-                    cycle_id = cumulative_id - cumulative_sum[i - 1] - 1
-                break
+        self.hide_cycles([cumulative_id])
+
+    def hide_cycles(self, cumulative_ids: List[int]) -> None:
+        """
+        Hide a set of cycles given their cumulative index in the container. The cycles are
+        grouped by experiment so that each experiment and the capacity retention are updated
+        only once.
+
+        Arguments
+        ---------
+            cumulative_ids : List[int]
+                the indices of the cycles obtained numbering sequentially the cycles of all
+                the experiments in the container
+        """
+        # Compute the last cumulative index of each experiment and the offset of its first cycle
+        cumulative_sum = np.cumsum(np.array(self.max_cycles_numbers) + 1) - 1
+        offsets = np.concatenate(([0], cumulative_sum[:-1] + 1))
+
+        cumulative_ids = np.asarray(cumulative_ids, dtype=int)
+        experiment_ids = np.searchsorted(cumulative_sum, cumulative_ids, side="left")
+        cycle_ids = cumulative_ids - offsets[experiment_ids]
+
+        for experiment_id in np.unique(experiment_ids):
+            indices = cycle_ids[experiment_ids == experiment_id]
+            self._experiments[experiment_id].hide_cycles([int(i) for i in indices])
 
-        self._experiments[experiment_id].hide_cycle(cycle_id)
         self._update_capacity_retention()
 
     @property
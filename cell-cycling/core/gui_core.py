@@ -77,7 +77,11 @@ class ProgramStatus:
             int
                 the index of the experiment in the experiment buffer
         """
-        return self.get_experiment_names().index(name)
+        # Scan the buffer directly without building the list of all the experiment names
+        for index, experiment in enumerate(self._experiments):
+            if experiment.name == name:
+                return index
+        raise ValueError(f"'{name}' is not in the experiment buffer")
 
     def append_experiment(self, experiment: Experiment) -> None:
         """
@@ -95,7 +99,7 @@ class ProgramStatus:
 
         # Check if the name of the incoming experiment is already present in the buffer, if
         # yes raise an error in order to avoid un-univocal experiment names assigment
-        if experiment.name in self.get_experiment_names():
+        if any(obj.name == experiment.name for obj in self._experiments):
             raise DuplicateName
 
         self._experiments.append(experiment)
@@ -191,11 +195,8 @@ class ExperimentSelector:
         # Fetch from the GUI session state variable the ProgramStatus object
         status: ProgramStatus = st.session_state["ProgramStatus"]
 
-        # Chech if the name of the experiment exist in the program memory
-        if name not in status.get_experiment_names():
-            raise ValueError
-
-        # Get the index of the experiment in the status memory
+        # Get the index of the experiment in the status memory (raises ValueError if the name
+        # of the experiment does not exist in the program memory)
         id = status.get_index_of(name)
         id_ordering = status[id].ordering
         # If cycles is None include all the available cycles in the experiment
@@ -208,8 +209,8 @@ class ExperimentSelector:
 
         # Else, check that all the given cycle index ar valid
         else:
+            number_of_cycles = len(status[id].manager.get_cycles(id_ordering))
             for number in cycles:
-                number_of_cycles = len(status[id].manager.get_cycles(id_ordering))
                 if number < 0 or number >= number_of_cycles:
                     raise ValueError(f"Cycle index {number} must be non negative and smaller than {number_of_cycles}")
 
@@ -226,17 +227,10 @@ class ExperimentSelector:
 
             # If the view already exist generate only the missing labels
             if name in self.view:
-                current_cycles = [obj.number for obj in self.view[name]]
-                current_lables = [obj.label for obj in self.view[name]]
-
-                updated_view = []
-                for idx in cycles:
-                    if idx in current_cycles:
-                        position = current_cycles.index(idx)
-                        updated_view.append(CycleFormat(idx, current_lables[position]))
-                    else:
-                        updated_view.append(CycleFormat(idx))
-                self.view[name] = updated_view
+                current_lables = {obj.number: obj.label for obj in self.view[name]}
+                self.view[name] = [
+                    CycleFormat(idx, current_lables.get(idx)) for idx in cycles
+                ]
 
             # Else create a new default view labelling
             else:
@@ -411,9 +405,12 @@ class ComparisonPlotSettings:
     font_size: int = 24
     axis_font_size: int = 32
     reverse: bool = False
+    webgl: bool = False
+    downsample: bool = False
     height: int = 600
     format: str = None
     width: int = 1200
+    scale: int = 1
 
 
 @dataclass
@@ -430,6 +427,10 @@ class CellcyclingPlotSettings:
     secondary_axis_marker: str = None
     marker_size: str = 8
     marker_with_border: str = False
+    webgl: bool = True
+    downsample: bool = False
+    hovermode: str = "x unified"
+    point_selection: bool = False
     which_grid: str = None
     font_size: str = 24
     axis_font_size: int = 32
@@ -0,0 +1,113 @@
+import json
+from typing import Union
+import streamlit as st
+import plotly.io as pio
+
+# Use the orjson engine to serialize the plotly figures sent to the browser and exported. The
+# setting is process-wide and is applied here, where every page importing the export helpers
+# gets it, so that the serialization does not depend on the first page opened by the user
+pio.json.config.default_engine = "orjson"
+
+# Define the maximum number of rendered images kept in memory and their lifetime in seconds
+EXPORT_CACHE_MAX_ENTRIES = 16
+EXPORT_CACHE_TTL = 60 * 60
+
+
+@st.cache_resource(show_spinner=False)
+def start_kaleido_server() -> None:
+    """
+    Starts the kaleido server used by plotly to render static images. The function is cached
+    as a resource so that a single browser process is started and shared by all the exports
+    instead of being launched at every call.
+    """
+    import kaleido
+
+    kaleido.start_sync_server(silence_warnings=True)
+
+
+@st.cache_data(show_spinner=False, max_entries=EXPORT_CACHE_MAX_ENTRIES, ttl=EXPORT_CACHE_TTL)
+def render_figure_bytes(
+    figure_json: str, format: str, width: int, height: Union[int, None], scale: int = 1
+) -> bytes:
+    """
+    Renders a serialized plotly figure into an image. The result is cached so that the
+    image is not rendered again by kaleido if the figure and the export options are left
+    unchanged. The image is cached as data, keyed on the content of the figure, so that each
+    caller receives its own copy and no shared object is handed out across sessions. The
+    number and the lifetime of the stored images are bounded to avoid keeping every rendered
+    image in memory.
+
+    Arguments
+    ---------
+        figure_json : str
+            the JSON representation of the figure to render
+        format : str
+            the format of the image
+        width : int
+            the width of the image in pixels
+        height : Union[int, None]
+            the height of the image in pixels (if None the height of the figure layout is used)
+        scale : int
+            the factor by which the image resolution is multiplied (raster formats only)
+
+    Returns
+    -------
+        bytes
+            the content of the rendered image file
+    """
+    start_kaleido_server()
+
+    # Convert the pdf files from the svg rendering of the figure avoiding the slower pdf
+    # printing backend of kaleido. If cairosvg (or the native cairo library it wraps) is not
+    # available fall back to the kaleido pdf export
+    if format == "pdf":
+        try:
+            import cairosvg
+        except (ImportError, OSError):
+            cairosvg = None
+
+        if cairosvg is not None:
+            svg = pio.to_image(
+                json.loads(figure_json),
+                format="svg",
+                width=width,
+                height=height,
+                validate=False,
+            )
+            return cairosvg.svg2pdf(bytestring=svg)
+
+    return pio.to_image(
+        json.loads(figure_json),
+        format=format,
+        width=width,
+        height=height,
+        scale=scale,
+        validate=False,
+    )
+
+
+def render_figure(figure, format: str, width: int, height: Union[int, None], scale: int = 1) -> bytes:
+    """
+    Serializes a plotly figure and renders it into an image using the cached renderer. The
+    function is meant to be passed as deferred data to the download buttons so that the figure
+    is serialized only when the download is requested.
+
+    Arguments
+    ---------
+        figure : go.Figure
+            the figure to render
+        format : str
+            the format of the image
+        width : int
+            the width of the image in pixels
+        height : Union[int, None]
+            the height of the image in pixels (if None the height of the figure layout is used)
+        scale : int
+            the factor by which the image resolution is multiplied (raster formats only)
+
+    Returns
+    -------
+        bytes
+            the content of the rendered image file
+    """
+    return render_figure_bytes(figure.to_json(), format, width, height, scale)
@@ -1,4 +1,6 @@
+import numpy as np
 import streamlit as st
+from typing import Tuple
 
 def set_production_page_style():
 
@@ -16,9 +18,67 @@ def set_production_page_style():
 def force_update_once():
     if "forced update executed" not in st.session_state:
         st.session_state["forced update executed"] = False
-        st.experimental_rerun()
+        st.rerun()
     if not st.session_state["forced update executed"]:
         st.session_state["forced update executed"] = True
         return
     st.session_state["forced update executed"] = False
-    st.experimental_rerun()
\ No newline at end of file
+    st.rerun()
+
+
+def downsample_lttb(x, y, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduces the number of points of a data series using the Largest-Triangle-Three-Buckets
+    algorithm. The first and last points are always kept while, for each bucket of the
+    remaining data, the point forming the largest triangle with the previously selected one
+    and with the average of the following bucket is retained. This preserves the visual shape
+    of the series while limiting the amount of data to be plotted.
+
+    Arguments
+    ---------
+        x : array-like
+            the x values of the series
+        y : array-like
+            the y values of the series
+        max_points : int
+            the maximum number of points to be retained
+
+    Returns
+    -------
+        Tuple[np.ndarray, np.ndarray]
+            the x and y values of the downsampled series (the original values if the series
+            contains less than max_points points)
+    """
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    n = len(x)
+
+    if max_points < 3 or n <= max_points:
+        return x, y
+
+    # Define the edges of the max_points - 2 buckets dividing the points between the first
+    # and the last one
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+
+    selected = np.empty(max_points, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(max_points - 2):
+        start, stop = edges[i], edges[i + 1]
+
+        # Compute the average point of the following bucket (the last point for the last one)
+        if i + 2 < len(edges):
+            next_start, next_stop = edges[i + 1], edges[i + 2]
+        else:
+            next_start, next_stop = n - 1, n
+        avg_x, avg_y = x[next_start:next_stop].mean(), y[next_start:next_stop].mean()
+
+        # Select the point of the bucket forming the triangle with the largest area
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:stop] - y[a])
+            - (x[a] - x[start:stop]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return x[selected], y[selected]
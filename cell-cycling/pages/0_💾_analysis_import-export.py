@@ -77,7 +77,7 @@ try:
         if submitted and source:
             print_log_entry(source.name, save=False)
             load_session_state(BytesIO(source.getvalue()))
-            st.experimental_rerun()
+            st.rerun()
 
 except st.runtime.scriptrunner.script_runner.RerunException:
     logger.info("EXPERIMENTAL RERUN CALLED")
@@ -1,11 +1,14 @@
 from typing import Dict, List, Tuple, Union
 import math, logging, sys, os, traceback, pickle
+from functools import partial
 import streamlit as st
 import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 from copy import deepcopy
+from dataclasses import replace
 
 from core.gui_core import (
     ProgramStatus,
@@ -15,7 +18,8 @@ from core.gui_core import (
     ComparisonPlotSettings,
 )
 from core.experiment import Experiment
-from core.utils import set_production_page_style, force_update_once
+from core.utils import set_production_page_style, force_update_once, downsample_lttb
+from core.plot_export import render_figure
 from core.colors import get_plotly_color, RGB_to_HEX
 from echemsuite.cellcycling.cycles import HalfCycle
 
@@ -41,6 +45,70 @@ HALFCYCLE_SERIES = [
     "energy",
 ]
 
+# Define a dispatch table associating to each halfcycle series title: the getter of the raw
+# data, the quantity ("volume", "area" or None) by which the data can be normalized, the label
+# of the raw series and the label and multiplicative factor of the normalized series
+HALFCYCLE_SERIES_TABLE = {
+    "time": (lambda h: h.time, None, "Time (s)", None, None),
+    "voltage": (lambda h: h.voltage, None, "Voltage (V)", None, None),
+    "current": (
+        lambda h: h.current,
+        "area",
+        "Current (A)",
+        "Current density (A/cm<sup>2</sup>)",
+        1.0,
+    ),
+    "charge": (
+        lambda h: h.Q,
+        "volume",
+        "Capacity (mAh)",
+        "Volumetric capacity (Ah/L)",
+        1e-3,
+    ),
+    "power": (
+        lambda h: h.power,
+        "area",
+        "Power (W)",
+        "Power density (mW/cm<sup>2</sup>)",
+        1e3,
+    ),
+    "energy": (
+        lambda h: h.energy,
+        "volume",
+        "Energy (mWh)",
+        "Energy density (Wh/L)",
+        1e-3,
+    ),
+}
+
+
+# Maximum number of points of each comparison plot trace when downsampling is enabled
+MAX_TRACE_POINTS = 4000
+
+# Define the style of the axes and of the layout shared by all the plots
+AXIS_STYLE = dict(showline=True, linecolor="black", gridwidth=1, gridcolor="#DDDDDD")
+LAYOUT_STYLE = dict(plot_bgcolor="#FFFFFF")
+
+
+@st.cache_resource
+def register_plot_template() -> str:
+    """
+    Registers, once per process, the "ges" plotly template containing the style shared by all
+    the plots and returns the name of the template to be applied to the figures.
+
+    Returns
+    -------
+        str
+            the name of the template combining the default plotly one and the "ges" one
+    """
+    pio.templates["ges"] = go.layout.Template(
+        layout=dict(xaxis=AXIS_STYLE, yaxis=AXIS_STYLE, **LAYOUT_STYLE)
+    )
+    return "plotly+ges"
+
+
+PLOT_TEMPLATE = register_plot_template()
+
 
 def get_halfcycle_series(
     halfcycle: HalfCycle,
@@ -64,42 +132,18 @@ def get_halfcycle_series(
         area: Union[None, float]
             if not None will trigger the normalization of current, charge and energy per unit area
     """
-    if title == "time":
-        return "Time (s)", halfcycle.time
-
-    elif title == "voltage":
-        return "Voltage (V)", halfcycle.voltage
-
-    elif title == "current":
-        current = halfcycle.current
-        if area is None:
-            return "Current (A)", current
-        else:
-            return "Current density (A/cm<sup>2</sup>)", current / area
-
-    elif title == "charge":
-        charge = halfcycle.Q
-        if volume is None:
-            return "Capacity (mAh)", charge
-        else:
-            return "Volumetric capacity (Ah/L)", charge / (1000 * volume)
+    if title not in HALFCYCLE_SERIES_TABLE:
+        raise ValueError
 
-    elif title == "power":
-        power = halfcycle.power
-        if area is None:
-            return "Power (W)", power
-        else:
-            return "Power density (mW/cm<sup>2</sup>)", 1000 * power / area
+    getter, quantity, label, scaled_label, factor = HALFCYCLE_SERIES_TABLE[title]
 
-    elif title == "energy":
-        energy = halfcycle.energy
-        if volume is None:
-            return "Energy (mWh)", energy
-        else:
-            return "Energy density (Wh/L)", energy / (1000 * volume)
+    # Select the normalization value associated to the series (None if not required)
+    scale = volume if quantity == "volume" else area if quantity == "area" else None
 
+    if scale is None:
+        return label, getter(halfcycle)
     else:
-        raise ValueError
+        return scaled_label, factor * getter(halfcycle) / scale
 
 
 # Create an instance of the ExperimentSelector class to be used to define the data to plot
@@ -135,6 +179,421 @@ def remove_experiment_from_series_buffer(name: str) -> None:
             selected_series.append(series)
 
 
+def build_stacked_traces(
+    experiment: Experiment,
+    selector: ExperimentSelector,
+    settings: StackedPlotSettings,
+) -> Tuple[List[go.Scatter], Tuple[str, str]]:
+    """
+    Builds the traces associated to the cycles of an experiment selected in the stacked plot.
+
+    Arguments
+    ---------
+        experiment : Experiment
+            the experiment from which the cycles must be taken
+        selector : ExperimentSelector
+            the selector object containing the cycles selected for the experiment
+        settings : StackedPlotSettings
+            the settings of the stacked plot
+
+    Returns
+    -------
+        List[go.Scatter]
+            the list of traces to be added to the experiment subplot
+        Tuple[str, str]
+            the labels of the x and y axis (None if no trace has been generated)
+    """
+    name = experiment.name
+    logger.debug(f"-> Plotting data for experiment {name}")
+
+    # Get the cycle list from the experiment
+    cycles = experiment._cycles
+    volume = experiment.volume if settings.scale_by_volume else None
+    area = experiment.area if settings.scale_by_area else None
+
+    # Get the user selected cycles and plot only the corresponden lines
+    num_traces = len(selector[name])
+    logger.debug(f"-> Number of traces: {num_traces}")
+
+    # Compute at once the shades associated to all the traces
+    shades = [
+        RGB_to_HEX(*shade)
+        for shade in experiment.color.get_shades(num_traces, reversed=settings.reverse)
+    ]
+
+    traces = []
+    x_label, y_label = None, None
+    for trace_id, cycle_id in enumerate(selector[name]):
+
+        # Get the shade associated to the current trace
+        shade = shades[trace_id]
+
+        # extract the cycle given the id selected
+        cycle = cycles[cycle_id]
+        series_name = selector.get_label(name, cycle_id)
+
+        # Print the charge halfcycle
+        if cycle.charge is not None and settings.show_charge is True:
+
+            x_label, x_series = get_halfcycle_series(
+                cycle.charge, settings.x_axis, volume, area
+            )
+            y_label, y_series = get_halfcycle_series(
+                cycle.charge, settings.y_axis, volume, area
+            )
+
+            traces.append(
+                go.Scatter(
+                    x=x_series,
+                    y=y_series,
+                    line=dict(color=shade),
+                    name=series_name,
+                    mode="lines",
+                )
+            )
+
+        # Print the discharge halfcycle
+        if cycle.discharge is not None and settings.show_discharge is True:
+
+            x_label, x_series = get_halfcycle_series(
+                cycle.discharge, settings.x_axis, volume, area
+            )
+            y_label, y_series = get_halfcycle_series(
+                cycle.discharge, settings.y_axis, volume, area
+            )
+
+            traces.append(
+                go.Scatter(
+                    x=x_series,
+                    y=y_series,
+                    line=dict(color=shade),
+                    name=series_name,
+                    showlegend=False if cycle.charge else True,
+                    mode="lines",
+                )
+            )
+
+    return traces, (x_label, y_label)
+
+
+@st.fragment
+def stacked_plot_export(fig: go.Figure, settings: StackedPlotSettings) -> None:
+    """
+    Renders the export section of the stacked plot. The function is executed as a streamlit
+    fragment so that changing the export options does not trigger the reconstruction of the
+    whole stacked plot.
+
+    Arguments
+    ---------
+        fig : go.Figure
+            the stacked plot figure
+        settings : StackedPlotSettings
+            the settings of the stacked plot
+    """
+    st.markdown("###### Export")
+    available_formats = ["png", "jpeg", "svg", "pdf"]
+    settings.format = st.selectbox(
+        "Select the format of the file",
+        available_formats,
+        index=available_formats.index(settings.format) if settings.format else 0,
+    )
+    logger.debug(f"-> Export format: {settings.format}")
+
+    suggested_width = int(2.5 * settings.plot_height)
+    settings.total_width = int(
+        st.number_input(
+            "Total width",
+            min_value=10,
+            value=settings.total_width if settings.total_width else suggested_width,
+        )
+    )
+    logger.debug(f"-> Export width: {settings.total_width}")
+
+    # Serialize and render the figure using the user selected width only when the download is
+    # requested. The rendered image is cached so that kaleido runs again only when the figure
+    # or the export options change
+    st.download_button(
+        "Download plot",
+        data=partial(render_figure, fig, settings.format, settings.total_width, None),
+        file_name=f"cycle_plot.{settings.format}",
+        on_click=lambda msg: logger.info(msg),
+        args=[f"DOWNLOAD cycle_plot.{settings.format}"],
+        disabled=True if not settings.show_charge and not settings.show_discharge else False,
+    )
+
+
+def build_comparison_figure(
+    series: List[SingleCycleSeries], settings: ComparisonPlotSettings
+) -> go.Figure:
+    """
+    Builds the comparison plot figure associated to a given set of cycle series.
+
+    Arguments
+    ---------
+        series : List[SingleCycleSeries]
+            the list of cycle series to be plotted
+        settings : ComparisonPlotSettings
+            the settings of the comparison plot
+
+    Returns
+    -------
+        go.Figure
+            the comparison plot figure
+    """
+    # Create a figure with a single plo
+    fig = make_subplots(cols=1, rows=1)
+
+    # Generate a list of all the currently loaded series associated to a given
+    # experiment in order to calculate the shadow of color to be used when the
+    # color_from_base option is selected
+    experiment_based_selection: Dict[str, List[int]] = {}
+    for entry in series:
+        exp_name = entry.experiment_name
+        if exp_name not in experiment_based_selection:
+            experiment_based_selection[exp_name] = [entry.cycle_id]
+        else:
+            experiment_based_selection[exp_name].append(entry.cycle_id)
+
+    # Select the trace type according to the rendering mode
+    Scatter = go.Scattergl if settings.webgl else go.Scatter
+
+    # For each selected series build the independent traces to be added to the plot, the
+    # properties shared by all the traces are defined only once
+    trace_spec = dict(mode="lines")
+    traces = []
+    experiment_based_shades: Dict[str, List[str]] = {}
+    for entry in series:
+
+        logger.debug(f"-> Plotting data for series {entry.label}")
+
+        name = entry.experiment_name
+        cycle_id = entry.cycle_id
+
+        experiment = experiments_by_name[name]
+        cycle = experiment._cycles[cycle_id]
+
+        label = entry.label
+
+        # Compute, once per experiment, the shades associated to the cycles
+        # of a given experiment
+        if name not in experiment_based_shades:
+            experiment_based_shades[name] = [
+                RGB_to_HEX(*shade)
+                for shade in experiment.color.get_shades(
+                    len(experiment_based_selection[name]),
+                    reversed=settings.reverse,
+                )
+            ]
+
+        trace_id = experiment_based_selection[name].index(cycle_id)
+        shade = experiment_based_shades[name][trace_id]
+        color = entry.hex_color if entry.color_from_base is False else shade
+
+        # Group the charge and discharge traces of the series under a single legend entry
+        legendgroup = f"{name}_{cycle_id}"
+
+        volume = (
+            experiment.volume
+            if settings.scale_by_volume
+            else None
+        )
+        area = (
+            experiment.area
+            if settings.scale_by_area
+            else None
+        )
+
+        # Print the charge halfcycle
+        if cycle.charge is not None:
+
+            x_label, x_series = get_halfcycle_series(
+                cycle.charge, settings.x_axis, volume, area
+            )
+            y_label, y_series = get_halfcycle_series(
+                cycle.charge, settings.y_axis, volume, area
+            )
+
+            if settings.downsample:
+                x_series, y_series = downsample_lttb(x_series, y_series, MAX_TRACE_POINTS)
+
+            traces.append(
+                Scatter(
+                    x=x_series,
+                    y=y_series,
+                    line=dict(color=color),
+                    name=label,
+                    legendgroup=legendgroup,
+                    **trace_spec,
+                )
+            )
+
+        # Print the discharge halfcycle
+        if cycle.discharge is not None:
+
+            x_label, x_series = get_halfcycle_series(
+                cycle.discharge, settings.x_axis, volume, area
+            )
+            y_label, y_series = get_halfcycle_series(
+                cycle.discharge, settings.y_axis, volume, area
+            )
+
+            if settings.downsample:
+                x_series, y_series = downsample_lttb(x_series, y_series, MAX_TRACE_POINTS)
+
+            traces.append(
+                Scatter(
+                    x=x_series,
+                    y=y_series,
+                    line=dict(color=color),
+                    name=label,
+                    legendgroup=legendgroup,
+                    showlegend=cycle.charge is None,
+                    **trace_spec,
+                )
+            )
+
+    # Add all the traces to the plot at once
+    fig.add_traces(traces, rows=1, cols=1)
+
+    # Update the settings of the x-axis
+    fig.update_xaxes(
+        title_text=x_label,
+        title_font={"size": settings.axis_font_size},
+    )
+
+    # Update the settings of the y-axis
+    fig.update_yaxes(
+        title_text=y_label,
+        title_font={"size": settings.axis_font_size},
+    )
+
+    # Update the settings of plot layout
+    fig.update_layout(
+        template=PLOT_TEMPLATE,
+        height=settings.height,
+        width=None,
+        font=dict(size=settings.font_size),
+    )
+
+    return fig
+
+
+def get_comparison_figure(
+    series: List[SingleCycleSeries], settings: ComparisonPlotSettings
+) -> go.Figure:
+    """
+    Returns the comparison plot figure associated to a given set of cycle series. The figure
+    is stored in the session state together with a fingerprint of the data and of the
+    settings used to build it, so that it is rebuilt only when one of them changes. The
+    export format, width and scale are not part of the fingerprint since they do not affect
+    the on-screen figure.
+
+    Arguments
+    ---------
+        series : List[SingleCycleSeries]
+            the list of cycle series to be plotted
+        settings : ComparisonPlotSettings
+            the settings of the comparison plot
+
+    Returns
+    -------
+        go.Figure
+            the comparison plot figure
+    """
+    # Collect the objects determining the figure content. The cycles buffer of each
+    # experiment is replaced every time the experiment is edited and it is therefore
+    # compared by identity.
+    experiments = [experiments_by_name[entry.experiment_name] for entry in series]
+    fingerprint = (
+        [replace(entry) for entry in series],
+        replace(settings, format=None, width=None, scale=None),
+        [
+            (exp._cycles, exp.volume, exp.area, exp.color.get_RGB())
+            for exp in experiments
+        ],
+    )
+
+    stored_figure = st.session_state.get("Page2_comparison_figure")
+    if stored_figure is not None and stored_figure[0] == fingerprint:
+        logger.debug("-> Using stored comparison figure")
+        return stored_figure[1]
+
+    fig = build_comparison_figure(series, settings)
+    st.session_state["Page2_comparison_figure"] = (fingerprint, fig)
+    return fig
+
+
+def comparison_plot_export_options(settings: ComparisonPlotSettings) -> None:
+    """
+    Renders the export options of the comparison plot. The options are set before the plot is
+    rendered so that the formats supported by plotly.js can be exported directly by the plot
+    toolbar in the browser.
+
+    Arguments
+    ---------
+        settings : ComparisonPlotSettings
+            the settings of the comparison plot
+    """
+    st.markdown("###### Export")
+    available_formats = ["svg", "png", "jpeg", "pdf"]
+    settings.format = st.selectbox(
+        "Select the format of the file",
+        available_formats,
+        index=available_formats.index(settings.format) if settings.format else 0,
+        key="format_comparison",
+    )
+    logger.debug(f"-> Export format {settings.format}")
+
+    settings.width = int(st.number_input("Plot width", min_value=10, value=settings.width))
+    logger.debug(f"-> Plot width {settings.width}")
+
+    # Let the user explicitly choose the resolution of the raster images
+    if settings.format in ["png", "jpeg"]:
+        settings.scale = int(
+            st.number_input(
+                "Export resolution scale",
+                min_value=1,
+                max_value=4,
+                value=settings.scale,
+            )
+        )
+        logger.debug(f"-> Export scale {settings.scale}")
+
+
+def comparison_plot_download(fig: go.Figure, settings: ComparisonPlotSettings) -> None:
+    """
+    Renders the download section of the comparison plot. The formats supported by plotly.js
+    are exported by the plot toolbar, while the pdf files are rendered on the server, serializing
+    the figure, only when the download is requested. The user defined width is passed directly
+    to the renderer leaving the stored figure unchanged.
+
+    Arguments
+    ---------
+        fig : go.Figure
+            the comparison plot figure
+        settings : ComparisonPlotSettings
+            the settings of the comparison plot
+    """
+    if settings.format in ["svg", "png", "jpeg"]:
+        st.info("Download the plot using the 📷 button of the plot toolbar")
+
+    else:
+        st.download_button(
+            "Download plot",
+            data=partial(
+                render_figure,
+                fig,
+                settings.format,
+                settings.width,
+                settings.height,
+                settings.scale,
+            ),
+            file_name=f"cycle_comparison_plot.{settings.format}",
+            on_click=lambda msg: logger.info(msg),
+            args=[f"DOWNLOAD cycle_plot.{settings.format}"],
+        )
+
+
 # Fetch a fresh instance of the Progam Status and Experiment Selection variables from the session state
 status: ProgramStatus = st.session_state["ProgramStatus"]
 selected_experiments: ExperimentSelector = st.session_state["Page2_CyclePlotSelection"]
@@ -173,6 +632,9 @@ try:
     # If there is one or more experiment loaded in the buffer start the plotter GUI
     if enable:
 
+        # Map, once for each run of the page, the experiment names to the experiment objects
+        experiments_by_name = {experiment.name: experiment for experiment in status}
+
         stacked_plot, comparison_plot = st.tabs(["Stacked plot", "Comparison plot"])
 
         # Define the stacked plot tab to compare cycling of different experiments
@@ -219,7 +681,7 @@ try:
                             selection
                         )  # Set the experiment in the selector
                         logger.info(f"ADDED experiment {selection} to selection")
-                        st.experimental_rerun()  # Rerun the page to update the selector box
+                        st.rerun()  # Rerun the page to update the selector box
 
             st.markdown("---")
 
@@ -249,7 +711,7 @@ try:
                         if remove_current:
                             logger.info("REMOVED {current_view} from view")
                             index = selected_experiments.remove(current_view)
-                            st.experimental_rerun()  # Rerun the page to update the GUI
+                            st.rerun()  # Rerun the page to update the GUI
 
                         st.markdown("---")
 
@@ -270,8 +732,7 @@ try:
                     with col2:
 
                         # Get the complete cycle list associated to the selected experiment
-                        id = status.get_index_of(current_view)
-                        cycles = status[id]._cycles
+                        cycles = experiments_by_name[current_view]._cycles
 
                         # Show the appropriate selection box
                         if (
@@ -359,7 +820,7 @@ try:
                             # temporary buffer used on the proper rerun
                             buffer_selection = st.multiselect(
                                 "Select the cycles",
-                                [obj.number for obj in cycles],
+                                experiments_by_name[current_view].cycle_numbers,
                                 default=manual_selection_buffer,
                             )
                             buffer_selection.sort()  # Sort the traces automatically
@@ -376,7 +837,7 @@ try:
                                     current_view,
                                     cycles=buffer_selection,
                                 )
-                                st.experimental_rerun()
+                                st.rerun()
 
                             # Print a remove all button to allow the user to remove alle the selected cycles
                             clear_current_view = st.button("🧹 Clear All")
@@ -384,7 +845,7 @@ try:
                                 logger.info("Cleared selection buffer")
                                 selected_experiments.empty_view(current_view)
                                 clean_manual_selection_buffer()
-                                st.experimental_rerun()  # Rerun to update the GUI
+                                st.rerun()  # Rerun to update the GUI
 
                         else:
 
@@ -473,13 +934,9 @@ try:
                         )
                         logger.debug(f"-> Shared X mode: {stacked_settings.shared_x}")
 
-                        volume_is_available = True
-                        for name in selected_experiments.view.keys():
-                            experiment_id = status.get_index_of(name)
-                            experiment = status[experiment_id]
-                            if experiment.volume is None:
-                                volume_is_available = False
-                                break
+                        volume_is_available = not any(
+                            experiments_by_name[name].volume is None for name in selected_experiments.view
+                        )
 
                         stacked_settings.scale_by_volume = st.checkbox(
                             "Scale values by volume",
@@ -492,13 +949,9 @@ try:
                             f"-> Scale by volume: {stacked_settings.scale_by_volume}"
                         )
 
-                        area_is_available = True
-                        for name in selected_experiments.view.keys():
-                            experiment_id = status.get_index_of(name)
-                            experiment = status[experiment_id]
-                            if experiment.area is None:
-                                area_is_available = False
-                                break
+                        area_is_available = not any(
+                            experiments_by_name[name].area is None for name in selected_experiments.view
+                        )
 
                         stacked_settings.scale_by_area = st.checkbox(
                             "Scale values by area",
@@ -579,100 +1032,23 @@ try:
 
                     x_label, y_label = None, None
 
-                    # For eache experiment update the correspondent subplot
+                    # Build the traces of each experiment and add them to the correspondent
+                    # subplot
                     for index, name in enumerate(selected_experiments.names):
-
-                        logger.debug(f"-> Plotting data for experiment {name}")
-
-                        # Get the cycle list from the experiment
-                        exp_id = status.get_index_of(name)
-                        experiment: Experiment = status[exp_id]
-                        cycles = experiment._cycles
-                        volume = (
-                            experiment.volume if stacked_settings.scale_by_volume else None
+                        traces, labels = build_stacked_traces(
+                            experiments_by_name[name],
+                            selector=selected_experiments,
+                            settings=stacked_settings,
                         )
-                        area = experiment.area if stacked_settings.scale_by_area else None
-
-                        # Get the user selected cycles and plot only the corresponden lines
-                        num_traces = len(selected_experiments[name])
-                        logger.debug(f"-> Number of traces: {num_traces}")
-
-                        for trace_id, cycle_id in enumerate(selected_experiments[name]):
-
-                            # Get the shade associated to the current trace
-                            shade = RGB_to_HEX(
-                                *experiment.color.get_shade(
-                                    trace_id, num_traces, reversed=stacked_settings.reverse
-                                )
-                            )
-
-                            # extract the cycle given the id selected
-                            cycle = cycles[cycle_id]
-
-                            # Print the charge halfcycle
-                            if (
-                                cycle.charge is not None
-                                and stacked_settings.show_charge is True
-                            ):
-
-                                series_name = selected_experiments.get_label(name, cycle_id)
-
-                                x_label, x_series = get_halfcycle_series(
-                                    cycle.charge, stacked_settings.x_axis, volume, area
-                                )
-                                y_label, y_series = get_halfcycle_series(
-                                    cycle.charge, stacked_settings.y_axis, volume, area
-                                )
-
-                                fig.add_trace(
-                                    go.Scatter(
-                                        x=x_series,
-                                        y=y_series,
-                                        line=dict(color=shade),
-                                        name=series_name,
-                                        mode="lines",
-                                    ),
-                                    row=index + 1,
-                                    col=1,
-                                )
-
-                            # Print the discharge halfcycle
-                            if (
-                                cycle.discharge is not None
-                                and stacked_settings.show_discharge is True
-                            ):
-
-                                series_name = selected_experiments.get_label(name, cycle_id)
-
-                                x_label, x_series = get_halfcycle_series(
-                                    cycle.discharge, stacked_settings.x_axis, volume, area
-                                )
-                                y_label, y_series = get_halfcycle_series(
-                                    cycle.discharge, stacked_settings.y_axis, volume, area
-                                )
-
-                                fig.add_trace(
-                                    go.Scatter(
-                                        x=x_series,
-                                        y=y_series,
-                                        line=dict(color=shade),
-                                        name=series_name,
-                                        showlegend=False if cycle.charge else True,
-                                        mode="lines",
-                                    ),
-                                    row=index + 1,
-                                    col=1,
-                                )
+                        if traces != []:
+                            fig.add_traces(traces, rows=index + 1, cols=1)
+                            x_label, y_label = labels
 
                     if x_label and y_label:
 
                         # Update the settings of the x-axis
                         fig.update_xaxes(
                             title_text=x_label,
-                            showline=True,
-                            linecolor="black",
-                            gridwidth=1,
-                            gridcolor="#DDDDDD",
                             title_font={"size": stacked_settings.axis_font_size},
                             range=stacked_settings.x_range,
                             dtick=stacked_settings.x_dtick,
@@ -685,10 +1061,6 @@ try:
                         # Update the settings of the y-axis
                         fig.update_yaxes(
                             title_text=y_label,
-                            showline=True,
-                            linecolor="black",
-                            gridwidth=1,
-                            gridcolor="#DDDDDD",
                             title_font={"size": stacked_settings.axis_font_size},
                             range=stacked_settings.y_range,
                             dtick=stacked_settings.y_dtick,
@@ -696,7 +1068,7 @@ try:
 
                         # Update the settings of plot layout
                         fig.update_layout(
-                            plot_bgcolor="#FFFFFF",
+                            template=PLOT_TEMPLATE,
                             height=stacked_settings.plot_height
                             * len(selected_experiments.names),
                             width=None,
@@ -724,7 +1096,7 @@ try:
                             stacked_settings.x_autorange = x_autorange
                             stacked_settings.x_range = None
                             logger.info(f"X Autorange: {stacked_settings.x_autorange}")
-                            st.experimental_rerun()
+                            st.rerun()
 
                         # If autorange is set to false and no range is available get the
                         # starting values for the range according to the automatic ones
@@ -754,7 +1126,7 @@ try:
                             if xrange != stacked_settings.x_range:
                                 stacked_settings.x_range = xrange
                                 logger.info(f"SET x range: {stacked_settings.x_range}")
-                                st.experimental_rerun()
+                                st.rerun()
 
                         # If the autorange is false deactivate custom ticks
                         else:
@@ -809,7 +1181,7 @@ try:
                             stacked_settings.y_autorange = y_autorange
                             stacked_settings.y_range = None
                             logger.info(f"Y Autorange: {stacked_settings.y_autorange}")
-                            st.experimental_rerun()
+                            st.rerun()
 
                         # If autorange is set to false and no range is available get the
                         # starting values for the range according to the automatic ones
@@ -840,7 +1212,7 @@ try:
                             if yrange != stacked_settings.y_range:
                                 stacked_settings.y_range = yrange
                                 logger.info(f"Y range set to: {stacked_settings.y_range}")
-                                st.experimental_rerun()
+                                st.rerun()
 
                         # If the autorange is false deactivate custom ticks
                         else:
@@ -881,49 +1253,7 @@ try:
                             stacked_settings.y_dtick = None
 
                     with st.expander("Export options:"):
-                        st.markdown("###### Export")
-                        available_formats = ["png", "jpeg", "svg", "pdf"]
-                        stacked_settings.format = st.selectbox(
-                            "Select the format of the file",
-                            available_formats,
-                            index=available_formats.index(stacked_settings.format)
-                            if stacked_settings.format
-                            else 0,
-                        )
-                        logger.debug(f"-> Export format: {stacked_settings.format}")
-
-                        suggested_width = int(2.5 * stacked_settings.plot_height)
-                        stacked_settings.total_width = int(
-                            st.number_input(
-                                "Total width",
-                                min_value=10,
-                                value=stacked_settings.total_width
-                                if stacked_settings.total_width
-                                else suggested_width,
-                            )
-                        )
-                        logger.debug(f"-> Export width: {stacked_settings.total_width}")
-
-                        # Set new layout options to account for the user selected width
-                        fig.update_layout(
-                            plot_bgcolor="#FFFFFF",
-                            height=stacked_settings.plot_height
-                            * len(selected_experiments.names),
-                            width=stacked_settings.total_width,
-                            font=dict(size=stacked_settings.font_size),
-                        )
-
-                        st.download_button(
-                            "Download plot",
-                            data=fig.to_image(format=stacked_settings.format),
-                            file_name=f"cycle_plot.{stacked_settings.format}",
-                            on_click=lambda msg: logger.info(msg),
-                            args=[f"DOWNLOAD cycle_plot.{stacked_settings.format}"],
-                            disabled=True
-                            if not stacked_settings.show_charge
-                            and not stacked_settings.show_discharge
-                            else False,
-                        )
+                        stacked_plot_export(fig, stacked_settings)
 
         # Define a comparison plot tab to compare cycle belonging to different experiments
         with comparison_plot:
@@ -942,11 +1272,10 @@ try:
                     st.markdown("##### Source experiment")
                     experiment_name = st.selectbox(
                         "Select the experiment",
-                        status.get_experiment_names(),
+                        list(experiments_by_name),
                     )
-                    exp_idx = status.get_index_of(experiment_name)
-                    experiment = status[exp_idx]
-                    cycle_numbers = [obj.number for obj in experiment._cycles]
+                    experiment = experiments_by_name[experiment_name]
+                    cycle_numbers = experiment.cycle_numbers
 
                     logger.debug(f"-> Selected experiment: {experiment_name}")
 
@@ -968,7 +1297,7 @@ try:
                             f"REMOVING experiment {experiment_name} from selection buffer"
                         )
                         remove_experiment_from_series_buffer(experiment_name)
-                        st.experimental_rerun()
+                        st.rerun()
 
                 with col2:
                     if selector_mode == "Stride based selector" and len(cycle_numbers) > 1:
@@ -1054,7 +1383,7 @@ try:
                                     )
                                 )
                             # logger.info(f"Selection buffer set to: {selected_series}")
-                            st.experimental_rerun()
+                            st.rerun()
 
                     elif selector_mode == "Stride based selector":
                         st.info(
@@ -1077,12 +1406,17 @@ try:
                             if entry.experiment_name == experiment_name
                         ]
 
+                        # Build a mask of the cycles that can still be added to the plot
+                        available_cycles = np.asarray(cycle_numbers)[
+                            ~np.isin(cycle_numbers, exclude)
+                        ].tolist()
+
                         selected_cycles = {}
                         if multiple:
                             logger.info("Entering multiple cycle selector")
                             cycle_numbers = st.multiselect(
                                 "Select the cycle",
-                                [n for n in cycle_numbers if n not in exclude],
+                                available_cycles,
                             )
                             logger.debug(f"-> Selected cycles: {cycle_numbers}")
 
@@ -1099,7 +1433,7 @@ try:
                             logger.info("Entering single cycle selector")
                             cycle_number = st.selectbox(
                                 "Select the cycle",
-                                [n for n in cycle_numbers if n not in exclude],
+                                available_cycles,
                             )
                             logger.debug(f"-> Selected cycle: {cycle_number}")
 
@@ -1130,7 +1464,7 @@ try:
                                     )
                                 )
 
-                            st.experimental_rerun()
+                            st.rerun()
 
                     elif selector_mode == "Series editor":
 
@@ -1159,7 +1493,7 @@ try:
                             if remove:
                                 logger.info(f"REMOVED series {series_label} form selection")
                                 del selected_series[series_position]
-                                st.experimental_rerun()
+                                st.rerun()
 
                             logger.info("Entering series edit menu")
                             st.markdown("##### Options:")
@@ -1191,7 +1525,7 @@ try:
                                 current_series.hex_color = new_color
                                 if override_color:
                                     current_series.color_from_base = False
-                                st.experimental_rerun()
+                                st.rerun()
 
                         else:
                             logger.debug(f"-> No series found")
@@ -1243,13 +1577,9 @@ try:
                         )
                         logger.debug(f"-> Y axis: {comparison_settings.y_axis}")
 
-                        volume_is_available = True
-                        for series in selected_series:
-                            experiment_id = status.get_index_of(series.experiment_name)
-                            experiment = status[experiment_id]
-                            if experiment.volume is None:
-                                volume_is_available = False
-                                break
+                        volume_is_available = not any(
+                            experiments_by_name[series.experiment_name].volume is None for series in selected_series
+                        )
 
                         comparison_settings.scale_by_volume = st.checkbox(
                             "Scale values by volume",
@@ -1263,13 +1593,9 @@ try:
                             f"-> Scale by volume: {comparison_settings.scale_by_volume}"
                         )
 
-                        area_is_available = True
-                        for series in selected_series:
-                            experiment_id = status.get_index_of(series.experiment_name)
-                            experiment = status[experiment_id]
-                            if experiment.area is None:
-                                area_is_available = False
-                                break
+                        area_is_available = not any(
+                            experiments_by_name[series.experiment_name].area is None for series in selected_series
+                        )
 
                         comparison_settings.scale_by_area = st.checkbox(
                             "Scale values by area",
@@ -1317,6 +1643,20 @@ try:
                             f"-> Reversed colorscale: {comparison_settings.reverse}"
                         )
 
+                        comparison_settings.webgl = st.checkbox(
+                            "High-performance rendering",
+                            value=comparison_settings.webgl,
+                            help="Render the plot using WebGL (recommended for large datasets)",
+                        )
+                        logger.debug(f"-> WebGL rendering: {comparison_settings.webgl}")
+
+                        comparison_settings.downsample = st.checkbox(
+                            "Downsample for speed",
+                            value=comparison_settings.downsample,
+                            help=f"Limit each trace to {MAX_TRACE_POINTS} points",
+                        )
+                        logger.debug(f"-> Downsampling: {comparison_settings.downsample}")
+
                         comparison_settings.height = int(
                             st.number_input(
                                 "Plot height",
@@ -1329,176 +1669,40 @@ try:
                         )
                         logger.debug(f"-> Plot height: {comparison_settings.height}")
 
+                    # Add to the right column the export options, set before the plot so that
+                    # they can be passed to the plot toolbar
+                    with st.expander("Export options"):
+                        comparison_plot_export_options(comparison_settings)
+                        export_section = st.container()
+
                 with col1:
 
                     logger.info("Entering plot rendering section")
 
-                    # Create a figure with a single plo
-                    fig = make_subplots(cols=1, rows=1)
-
-                    # Generate a list of all the currently loaded series associated to a given
-                    # experiment in order to calculate the shadow of color to be used when the
-                    # color_from_base option is selected
-                    experiment_based_selection: Dict[str, List[int]] = {}
-                    for entry in selected_series:
-                        exp_name = entry.experiment_name
-                        if exp_name not in experiment_based_selection:
-                            experiment_based_selection[exp_name] = [entry.cycle_id]
-                        else:
-                            experiment_based_selection[exp_name].append(entry.cycle_id)
-
-                    # For each selected series add an independent trace to the plot
-                    for entry in selected_series:
-
-                        logger.debug(f"-> Plotting data for series {entry.label}")
-
-                        name = entry.experiment_name
-                        cycle_id = entry.cycle_id
-
-                        exp_idx = status.get_index_of(name)
-                        experiment = status[exp_idx]
-                        cycle = experiment._cycles[cycle_id]
-
-                        label = entry.label
-
-                        # Compute the shade associated to the cycle of a given experiment
-                        trace_id = experiment_based_selection[name].index(cycle_id)
-                        num_traces = len(experiment_based_selection[name])
-                        shade = RGB_to_HEX(
-                            *experiment.color.get_shade(
-                                trace_id, num_traces, reversed=comparison_settings.reverse
-                            )
-                        )
-                        color = entry.hex_color if entry.color_from_base is False else shade
-
-                        volume = (
-                            status[exp_idx].volume
-                            if comparison_settings.scale_by_volume
-                            else None
-                        )
-                        area = (
-                            status[exp_idx].area
-                            if comparison_settings.scale_by_area
-                            else None
-                        )
-
-                        # Print the charge halfcycle
-                        if cycle.charge is not None:
-
-                            x_label, x_series = get_halfcycle_series(
-                                cycle.charge, comparison_settings.x_axis, volume, area
-                            )
-                            y_label, y_series = get_halfcycle_series(
-                                cycle.charge, comparison_settings.y_axis, volume, area
-                            )
-
-                            fig.add_trace(
-                                go.Scatter(
-                                    x=x_series,
-                                    y=y_series,
-                                    line=dict(color=color),
-                                    name=label,
-                                    mode="lines",
-                                ),
-                                row=1,
-                                col=1,
-                            )
-
-                        # Print the discharge halfcycle
-                        if cycle.discharge is not None:
-
-                            x_label, x_series = get_halfcycle_series(
-                                cycle.discharge, comparison_settings.x_axis, volume, area
-                            )
-                            y_label, y_series = get_halfcycle_series(
-                                cycle.discharge, comparison_settings.y_axis, volume, area
-                            )
-
-                            fig.add_trace(
-                                go.Scatter(
-                                    x=x_series,
-                                    y=y_series,
-                                    line=dict(color=color),
-                                    name=label,
-                                    showlegend=False if cycle.charge else True,
-                                    mode="lines",
-                                ),
-                                row=1,
-                                col=1,
-                            )
-
-                    # Update the settings of the x-axis
-                    fig.update_xaxes(
-                        title_text=x_label,
-                        showline=True,
-                        linecolor="black",
-                        gridwidth=1,
-                        gridcolor="#DDDDDD",
-                        title_font={"size": comparison_settings.axis_font_size},
+                    fig = get_comparison_figure(selected_series, comparison_settings)
+
+                    browser_format = comparison_settings.format in ["svg", "png", "jpeg"]
+                    st.plotly_chart(
+                        fig,
+                        use_container_width=True,
+                        theme=None,
+                        config={
+                            "toImageButtonOptions": {
+                                "format": comparison_settings.format if browser_format else "png",
+                                "filename": "cycle_comparison_plot",
+                                "width": comparison_settings.width,
+                                "height": comparison_settings.height,
+                                "scale": comparison_settings.scale,
+                            }
+                        },
                     )
 
-                    # Update the settings of the y-axis
-                    fig.update_yaxes(
-                        title_text=y_label,
-                        showline=True,
-                        linecolor="black",
-                        gridwidth=1,
-                        gridcolor="#DDDDDD",
-                        title_font={"size": comparison_settings.axis_font_size},
-                    )
-
-                    # Update the settings of plot layout
-                    fig.update_layout(
-                        plot_bgcolor="#FFFFFF",
-                        height=comparison_settings.height,
-                        width=None,
-                        font=dict(size=comparison_settings.font_size),
-                    )
-
-                    st.plotly_chart(fig, use_container_width=True, theme=None)
-
                 with col2:
 
                     logger.info("Re-Entering plot option section to render export section")
 
-                    # Add to the right column the export option
-                    with st.expander("Export options"):
-                        st.markdown("###### Export")
-                        available_formats = ["png", "jpeg", "svg", "pdf"]
-                        comparison_settings.format = st.selectbox(
-                            "Select the format of the file",
-                            available_formats,
-                            index=available_formats.index(comparison_settings.format)
-                            if comparison_settings.format
-                            else 0,
-                            key="format_comparison",
-                        )
-                        logger.debug(f"-> Export format {comparison_settings.format}")
-
-                        comparison_settings.width = int(
-                            st.number_input(
-                                "Plot width",
-                                min_value=10,
-                                value=comparison_settings.width,
-                            )
-                        )
-                        logger.debug(f"-> Plot width {comparison_settings.width}")
-
-                        # Update the settings of plot layout to account for the user define width
-                        fig.update_layout(
-                            plot_bgcolor="#FFFFFF",
-                            height=comparison_settings.height,
-                            width=comparison_settings.width,
-                            font=dict(size=comparison_settings.font_size),
-                        )
-
-                        st.download_button(
-                            "Download plot",
-                            data=fig.to_image(format=comparison_settings.format),
-                            file_name=f"cycle_comparison_plot.{comparison_settings.format}",
-                            on_click=lambda msg: logger.info(msg),
-                            args=[f"DOWNLOAD cycle_plot.{comparison_settings.format}"],
-                        )
+                    with export_section:
+                        comparison_plot_download(fig, comparison_settings)
 
     # If there are no experiments in the buffer suggest to the user to load data form the main page
     else:
@@ -1,14 +1,13 @@
 import sys, os, logging, traceback, pickle, openpyxl
 from typing import Dict, List, Tuple, Union
 import streamlit as st
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
-from streamlit_plotly_events import plotly_events
+import numpy as np
 from io import BytesIO
+from functools import partial
 
 from core.gui_core import ProgramStatus, CellcyclingPlotSettings
 from core.experiment import Experiment, ExperimentContainer
-from core.utils import set_production_page_style, force_update_once
+from core.utils import set_production_page_style, force_update_once, downsample_lttb
 from core.colors import get_plotly_color
 
 
@@ -33,6 +32,21 @@ MARKERS = {
     "🞤": "cross",
     "🞭": "x",
 }
+MARKER_KEYS = tuple(MARKERS.keys())
+MARKER_INDEX = {marker: index for index, marker in enumerate(MARKER_KEYS)}
+
+# Define, for each primary axis marker, the markers available for the secondary axis
+SECONDARY_MARKER_KEYS = {primary: tuple(m for m in MARKER_KEYS if m != primary) for primary in MARKER_KEYS}
+
+# Define the maximum number of points of each trace when downsampling is enabled
+MAX_TRACE_POINTS = 4000
+
+# Define the available hover modes with the corresponding plotly layout value
+HOVER_MODES = {
+    "x unified": "x unified",
+    "closest": "closest",
+    "Disabled": False,
+}
 
 # Define a list of possible alternatives for the y axis
 Y_OPTIONS = [
@@ -44,6 +58,49 @@ Y_OPTIONS = [
     "Total capacity - Discharge",
     "Average power - Discharge",
 ]
+Y_OPTION_INDEX = {option: index for index, option in enumerate(Y_OPTIONS)}
+
+# Define, for each primary axis series, the series available for the secondary axis
+SECONDARY_Y_OPTIONS = {primary: tuple(opt for opt in Y_OPTIONS if opt != primary) for primary in Y_OPTIONS}
+
+# Define the modes in which the y axes can be shown
+Y_MODES = ["Both", "Only primary", "Only secondary"]
+
+
+# Define a dispatch table associating to each efficiency series the getter of the data from the
+# cellcycling object and the label of the series
+EFFICIENCY_SERIES_TABLE = {
+    "Columbic efficiency": (lambda cellcycling: cellcycling.coulomb_efficiencies, "Columbic efficiency (%)"),
+    "Energy efficiency": (lambda cellcycling: cellcycling.energy_efficiencies, "Energy efficiency (%)"),
+    "Voltaic Efficiency": (lambda cellcycling: cellcycling.voltage_efficiencies, "Voltaic Efficiency (%)"),
+}
+
+# Define a dispatch table associating to each discharge series: the getter of the aggregated
+# data, the quantity ("volume" or "area") by which the data can be normalized, the label of the
+# raw series and the label and multiplicative factor of the normalized series
+DISCHARGE_SERIES_TABLE = {
+    "Total energy - Discharge": (
+        lambda aggregates: aggregates.total_energy,
+        "volume",
+        "Energy (mWh)",
+        "Energy density (Wh/L)",
+        1e-3,
+    ),
+    "Total capacity - Discharge": (
+        lambda aggregates: aggregates.capacity,
+        "volume",
+        "Capacity (mAh)",
+        "Volumetric capacity (Ah/L)",
+        1e-3,
+    ),
+    "Average power - Discharge": (
+        lambda aggregates: aggregates.average_power,
+        "area",
+        "Power (W)",
+        "Power density (mW/cm<sup>2</sup>)",
+        1e3,
+    ),
+}
 
 
 # Define a function to exracte the wanted dataset from a cellcycling experiment give the label
@@ -53,57 +110,33 @@ def get_data_series(
     container: ExperimentContainer,
     scale_by_volume: bool = False,
     scale_by_area: bool = False,
-) -> Tuple[str, List[float]]:
+) -> Tuple[str, Union[List[float], np.ndarray]]:
 
     if option not in Y_OPTIONS:
         raise TypeError
 
     experiment = container[index]
-    cellcycling = experiment.cellcycling
-
-    volume = experiment.volume if scale_by_volume else None
-    area = experiment.area if scale_by_area else None
 
     if option == "Capacity retention":
         return "Capacity retention (%)", container.capacity_retention(index)
 
-    elif option == "Columbic efficiency":
-        return "Columbic efficiency (%)", cellcycling.coulomb_efficiencies
+    elif option in EFFICIENCY_SERIES_TABLE:
+        getter, label = EFFICIENCY_SERIES_TABLE[option]
+        return label, getter(experiment.cellcycling)
 
-    elif option == "Energy efficiency":
-        return "Energy efficiency (%)", cellcycling.energy_efficiencies
+    elif option in DISCHARGE_SERIES_TABLE:
+        getter, quantity, label, scaled_label, factor = DISCHARGE_SERIES_TABLE[option]
 
-    elif option == "Voltaic Efficiency":
-        return "Voltaic Efficiency (%)", cellcycling.voltage_efficiencies
-
-    elif option == "Total energy - Discharge":
-        total_energies = [cycle.discharge.total_energy for cycle in cellcycling]
-        if volume is None:
-            return "Energy (mWh)", total_energies
+        # Select the normalization value associated to the series (None if not required)
+        if quantity == "volume":
+            scale = experiment.volume if scale_by_volume else None
         else:
-            normalized_energies = [energy / (1000 * volume) for energy in total_energies]
-            return "Energy density (Wh/L)", normalized_energies
-
-    elif option == "Total capacity - Discharge":
-        total_capacities = [cycle.discharge.capacity for cycle in cellcycling]
+            scale = experiment.area if scale_by_area else None
 
-        if volume is None:
-            return "Capacity (mAh)", total_capacities
+        if scale is None:
+            return label, getter(experiment.aggregates)
         else:
-            normalized_energies = [capacity / (1000 * volume) for capacity in total_capacities]
-            return "Volumetric capacity (Ah/L)", normalized_energies
-
-    elif option == "Average power - Discharge":
-        average_powers = [cycle.discharge.power.mean() for cycle in cellcycling]
-
-        if area is None:
-            return "Power (W)", average_powers
-        else:
-            average_powers = [1000 * power / area for power in average_powers]
-            return (
-                "Power density (mW/cm<sup>2</sup>)",
-                average_powers,
-            )
+            return scaled_label, factor * getter(experiment.aggregates) / scale
 
     else:
         raise RuntimeError
@@ -114,9 +147,98 @@ if "ExperimentContainers" not in st.session_state:
     st.session_state["ExperimentContainers"] = []
     st.session_state["Cellcycling_plots_settings"] = {}
 
+# Define the maximum number of data series kept in the session buffer
+MAX_CACHED_SERIES = 256
+
+# Initialize the buffer of the data series computed for each experiment
+if "Cellcycling_series_cache" not in st.session_state:
+    st.session_state["Cellcycling_series_cache"] = {}
+
 # Fetch fresh reference to the variables in session state
 available_containers: List[ExperimentContainer] = st.session_state["ExperimentContainers"]
+containers_by_name: Dict[str, ExperimentContainer] = {c.name: c for c in available_containers}
 plot_settings_dict: Dict[str, CellcyclingPlotSettings] = st.session_state["Cellcycling_plots_settings"]
+series_cache: Dict[tuple, tuple] = st.session_state["Cellcycling_series_cache"]
+
+
+def get_cached_data_series(
+    option: str,
+    index: int,
+    container: ExperimentContainer,
+    scale_by_volume: bool = False,
+    scale_by_area: bool = False,
+) -> Tuple[str, Union[List[float], np.ndarray]]:
+    """
+    Returns the same data series of get_data_series caching, in the session state, the series
+    that depend only on the experiment. Each series is stored together with the cellcycling
+    object from which it has been computed so that, if the experiment is edited (a new
+    cellcycling object is created), the series is automatically recomputed. The capacity
+    retention, depending on the container reference, is taken directly from the container.
+    At most MAX_CACHED_SERIES series are kept, dropping first the least recently stored ones.
+
+    Arguments
+    ---------
+        option : str
+            the name of the series (must be one of the Y_OPTIONS entries)
+        index : int
+            the index of the experiment in the container
+        container : ExperimentContainer
+            the container holding the experiment
+        scale_by_volume : bool
+            if set to True will scale the series by the experiment volume
+        scale_by_area : bool
+            if set to True will scale the series by the experiment area
+
+    Returns
+    -------
+        Tuple[str, Union[List[float], np.ndarray]]
+            the label of the series and the series values
+    """
+    if option == "Capacity retention":
+        return get_data_series(option, index, container, scale_by_volume, scale_by_area)
+
+    experiment = container[index]
+    volume = experiment.volume if scale_by_volume else None
+    area = experiment.area if scale_by_area else None
+
+    key = (experiment.name, option, volume, area)
+    if key in series_cache and series_cache[key][0] is experiment.cellcycling:
+        return series_cache[key][1]
+
+    series = get_data_series(option, index, container, scale_by_volume, scale_by_area)
+
+    # Drop the least recently stored series (e.g. the ones of removed or renamed experiments)
+    # once the buffer is full
+    series_cache.pop(key, None)
+    while len(series_cache) >= MAX_CACHED_SERIES:
+        del series_cache[next(iter(series_cache))]
+
+    series_cache[key] = (experiment.cellcycling, series)
+    return series
+
+
+def limits_changed(
+    old: Union[List[Union[None, float]], None], new: Union[List[float], None]
+) -> bool:
+    """
+    Checks if an axis range differs from the stored one ignoring the floating point noise
+    introduced by plotly in the evaluation of the ranges.
+
+    Arguments
+    ---------
+        old : Union[List[Union[None, float]], None]
+            the range stored in the plot limits
+        new : Union[List[float], None]
+            the range evaluated from the figure
+
+    Returns
+    -------
+        bool
+            True if the range changed, False otherwise
+    """
+    if old is None or new is None or None in old:
+        return old != new
+    return not np.allclose(old, new, rtol=1e-6, atol=0.0)
 
 
 def clear_y_plot_limit(plot_limits: Dict[str, List[Union[None, float]]], which: str = "both") -> None:
@@ -131,8 +253,441 @@ def clear_y_plot_limit(plot_limits: Dict[str, List[Union[None, float]]], which:
         raise RuntimeError
 
 
+def build_xlsx_export(
+    experiment_names: List[str],
+    headers: List[str],
+    number_of_cycles: List[int],
+    series_values: List[List[list]],
+) -> bytes:
+    """
+    Builds the xlsx file containing the selected data series of the experiments of a container.
+    The first two rows of the sheet hold the name of the experiment and the header of each
+    series while the following ones hold the values associated to each cycle.
+
+    Arguments
+    ---------
+        experiment_names : List[str]
+            the names of the experiments in the container
+        headers : List[str]
+            the header of each one of the selected series
+        number_of_cycles : List[int]
+            the number of cycles of each experiment
+        series_values : List[List[list]]
+            the values of each selected series for each experiment
+
+    Returns
+    -------
+        bytes
+            the content of the xlsx file
+    """
+    # Define the csv data in string format
+    csv_data = ""
+
+    # Write the header for each experiment
+    for name in experiment_names:
+        for _ in headers:
+            csv_data += f"{name},"
+
+    csv_data = csv_data[:-1]
+    csv_data += "\n"
+
+    for _ in experiment_names:
+        for header in headers:
+            csv_data += f"{header},"
+
+    csv_data = csv_data[:-1]
+    csv_data += "\n"
+
+    # Write the data associated to each experiment
+    cycle_index = 0
+
+    while cycle_index < max(number_of_cycles):
+        for eidx in range(len(experiment_names)):
+            for values in series_values[eidx]:
+                if number_of_cycles[eidx] > cycle_index:
+                    csv_data += f"{values[cycle_index]},"
+                else:
+                    csv_data += ","
+
+        csv_data = csv_data[:-1]
+        csv_data += "\n"
+        cycle_index += 1
+
+    # Convert the csv file into xlsx format
+    xls_bytestream = BytesIO()
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    for r, row in enumerate(csv_data.split("\n")):
+        if r < 2:
+            sheet.append(row.split(","))
+        else:
+            sheet.append([float(x) if x != "" and x != "None" else x for x in row.split(",")])
+    workbook.save(xls_bytestream)
+
+    return xls_bytestream.getvalue()
+
+
+def downsample_series(x: np.ndarray, y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduces a container series to at most MAX_TRACE_POINTS points using the LTTB algorithm.
+    The missing values (NaN), not drawn in the plot, are discarded before the downsampling.
+
+    Arguments
+    ---------
+        x : np.ndarray
+            the cycle numbers of the series
+        y : np.ndarray
+            the values of the series
+
+    Returns
+    -------
+        Tuple[np.ndarray, np.ndarray]
+            the cycle numbers and the values of the downsampled series
+    """
+    valid = ~np.isnan(y)
+    x, y = downsample_lttb(x[valid], y[valid], MAX_TRACE_POINTS)
+    return x.astype(np.int32), y.astype(np.float32)
+
+
+def build_cellcycling_traces(
+    plot_settings: CellcyclingPlotSettings,
+) -> Tuple[List[dict], List[bool], Union[str, None], Union[str, None]]:
+    """
+    Builds the traces of a cell-cycling plot generating, for each visible container, a single
+    trace for each of the axes currently shown.
+
+    Arguments
+    ---------
+        plot_settings : CellcyclingPlotSettings
+            the settings of the cell-cycling plot
+
+    Returns
+    -------
+        Tuple[List[dict], List[bool], Union[str, None], Union[str, None]]
+            the list of traces (as plain dictionaries), the list of flags indicating which trace
+            belongs to the secondary axis and the labels of the primary and secondary axis (None
+            if the axis is not shown)
+    """
+    # Select the trace type according to the rendering mode. The traces are built as plain
+    # dictionaries, validated only once when added to the figure, instead of graph objects
+    trace_type = "scattergl" if plot_settings.webgl else "scatter"
+
+    # Compute only the series associated to the axes currently shown
+    show_primary = plot_settings.y_axis_mode != "Only secondary"
+    show_secondary = plot_settings.y_axis_mode != "Only primary"
+    primary_label, secondary_label = None, None
+
+    # Collect the traces, and the axis to which they belong, to add them to the figure at once
+    traces, secondary_ys = [], []
+
+    # Iterate over each container
+    for container in available_containers:
+
+        # Skip the hidden and the empty containers before fetching any series so that the data
+        # and the axis labels are taken only from the visible containers
+        if container.name not in plot_settings.visible_containers:
+            logger.debug(f"-> Skipping hidden container {container.name}")
+            continue
+
+        if len(container) == 0:
+            logger.debug(f"-> Skipping empty container {container.name}")
+            continue
+
+        logger.info(f"Plotting container {container.name}")
+
+        # Compute the offset of the cycle numbers of each experiment so that the cycles of
+        # the whole container are numbered sequentially
+        offsets = np.cumsum(
+            [0] + [number + 1 for number in container.max_cycles_numbers[:-1]], dtype=np.int32
+        )
+
+        experiment: Experiment
+        cycle_index, primary_axis, secondary_axis = [], [], []
+
+        # Iterate over each cell_cycling object in the container collecting the series so
+        # that a single trace per axis can be generated for the whole container (the values
+        # are stored as 32-bit arrays, more than enough for plotting, to halve the payload)
+        for cycling_index, experiment in enumerate(container):
+
+            numbers = np.asarray(experiment.cellcycling.numbers, dtype=np.int32)
+            cycle_index.append(numbers + offsets[cycling_index])
+
+            if show_primary:
+                primary_label, primary_series = get_cached_data_series(
+                    plot_settings.primary_axis_name,
+                    cycling_index,
+                    container,
+                    scale_by_volume=plot_settings.scale_by_volume,
+                    scale_by_area=plot_settings.scale_by_area,
+                )
+                primary_axis.append(np.asarray(primary_series, dtype=np.float32))
+
+            if show_secondary:
+                secondary_label, secondary_series = get_cached_data_series(
+                    plot_settings.secondary_axis_name,
+                    cycling_index,
+                    container,
+                    scale_by_volume=plot_settings.scale_by_volume,
+                    scale_by_area=plot_settings.scale_by_area,
+                )
+                secondary_axis.append(np.asarray(secondary_series, dtype=np.float32))
+
+        cycle_index = np.concatenate(cycle_index)
+
+        # Set the container color directly on the markers, the only element drawn by the traces
+        # (the marker style, shared by all the traces, is applied directly to the figure)
+        container_marker_style = dict(color=container.hex_color)
+
+        if show_primary:
+            x, y = cycle_index, np.concatenate(primary_axis)
+            if plot_settings.downsample:
+                x, y = downsample_series(x, y)
+
+            traces.append(
+                dict(
+                    type=trace_type,
+                    x=x,
+                    y=y,
+                    name=container.name,
+                    mode="markers",
+                    marker=container_marker_style,
+                    legendgroup=container.name,
+                )
+            )
+            secondary_ys.append(False)
+
+        if show_secondary:
+            x, y = cycle_index, np.concatenate(secondary_axis)
+            if plot_settings.downsample:
+                x, y = downsample_series(x, y)
+
+            traces.append(
+                dict(
+                    type=trace_type,
+                    x=x,
+                    y=y,
+                    name=container.name,
+                    mode="markers",
+                    marker=container_marker_style,
+                    legendgroup=container.name,
+                    showlegend=not show_primary,
+                )
+            )
+            secondary_ys.append(True)
+
+    return traces, secondary_ys, primary_label, secondary_label
+
+
+def get_cellcycling_traces(
+    plot_settings: CellcyclingPlotSettings, unique_id: str
+) -> Tuple[List[dict], List[bool], Union[str, None], Union[str, None]]:
+    """
+    Returns the same traces of build_cellcycling_traces storing them, in the session state,
+    together with a fingerprint of the containers and of the settings used to build them, so
+    that the traces are rebuilt only when the plotted data change. The cellcycling object of
+    each experiment is replaced every time the experiment is edited and it is therefore
+    compared by identity.
+
+    Arguments
+    ---------
+        plot_settings : CellcyclingPlotSettings
+            the settings of the cell-cycling plot
+        unique_id : str
+            the unique identifier of the plot
+
+    Returns
+    -------
+        Tuple[List[dict], List[bool], Union[str, None], Union[str, None]]
+            the list of traces (as plain dictionaries), the list of flags indicating which trace
+            belongs to the secondary axis and the labels of the primary and secondary axis (None
+            if the axis is not shown)
+    """
+    fingerprint = (
+        plot_settings.primary_axis_name,
+        plot_settings.secondary_axis_name,
+        plot_settings.y_axis_mode,
+        plot_settings.scale_by_volume,
+        plot_settings.scale_by_area,
+        plot_settings.webgl,
+        plot_settings.downsample,
+        tuple(plot_settings.visible_containers),
+        [
+            (
+                container.name,
+                container.hex_color,
+                tuple(container.reference),
+                [(exp.cellcycling, exp.volume, exp.area) for exp in container],
+            )
+            for container in available_containers
+        ],
+    )
+
+    stored_traces = st.session_state.get(f"Cellcycling_traces_{unique_id}")
+    if stored_traces is not None and stored_traces[0] == fingerprint:
+        logger.debug("-> Using stored cell-cycling traces")
+        return stored_traces[1]
+
+    traces = build_cellcycling_traces(plot_settings)
+    st.session_state[f"Cellcycling_traces_{unique_id}"] = (fingerprint, traces)
+    return traces
+
+
+# Render the container editor as a streamlit fragment so that selecting the container and the
+# operation to carry out does not rerun the plotter. Every edit of a container triggers a full
+# rerun of the page so that the plots are updated accordingly
+@st.fragment
+def container_editor_widget() -> None:
+
+    with st.expander("Edit experiment container", expanded=False):
+        logger.info("Entering container editor")
+
+        st.markdown("#### Edit an existing container")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            selected_container_name = st.selectbox(
+                "Select the container to edit",
+                list(containers_by_name),
+            )
+            logger.debug(f"-> Selected container: {selected_container_name}")
+
+            delete = st.button("❌ Delete the container")
+
+            if delete:
+                logger.info(f"REMOVING container '{selected_container_name}'")
+                available_containers.remove(containers_by_name[selected_container_name])
+                st.rerun()
+
+            st.markdown("---")
+
+            operation_mode = st.radio(
+                "Select the operation mode",
+                ["Change reference", "Add experiment", "Remove experiment"],
+            )
+
+        if selected_container_name != None:
+
+            selected_container: ExperimentContainer = containers_by_name[selected_container_name]
+
+            with col2:
+
+                if operation_mode == "Change reference":
+
+                    logger.info("Render section to add change reference cycle of the container")
+
+                    if len(selected_container) != 0:
+
+                        st.markdown("###### Change container reference")
+
+                        current_reference = selected_container.reference
+                        exp_index = int(
+                            st.number_input(
+                                "Select experiment index",
+                                value=current_reference[0],
+                                min_value=0,
+                                max_value=len(selected_container) - 1,
+                                step=1,
+                                disabled=True if len(selected_container) == 0 else False,
+                            )
+                        )
+
+                        cycle_index = int(
+                            st.number_input(
+                                "Select cycle index",
+                                value=current_reference[1],
+                                min_value=0,
+                                max_value=len(selected_container[exp_index]._cycles) - 1,
+                                step=1,
+                                disabled=True if len(selected_container) == 0 else False,
+                            )
+                        )
+
+                        apply_ref = st.button("🗒️ Apply new reference")
+
+                        if apply_ref:
+                            selected_container.reference = [exp_index, cycle_index]
+                            st.rerun()
+
+                    else:
+                        st.info(
+                            "**INFO:** Cannot change reference in an empty conatiner. Please add experiments using the `Add experiment` page."
+                        )
+
+                    # selected_container.
+
+                elif operation_mode == "Add experiment":
+                    logger.info("Render section to add new experiment to container")
+                    st.markdown("###### Add another experiment")
+
+                    container_exp_names = set(selected_container.get_experiment_names)
+                    valid_exp_names = [
+                        name
+                        for name in experiments_by_name
+                        if name not in container_exp_names
+                    ]
+                    experiment_name = st.selectbox(
+                        "Select the experiments to add to the container",
+                        valid_exp_names,
+                    )
+                    logger.debug(f"-> Selected experiment: '{experiment_name}'")
+
+                    add = st.button(
+                        "➕ Add experiment",
+                        disabled=True if experiment_name is None else False,
+                    )
+
+                    if add:
+                        logger.info(
+                            f"ADD experiment {experiment_name} to container {selected_container_name}"
+                        )
+                        selected_container.add_experiment(experiments_by_name[experiment_name])
+                        st.rerun()
+
+                else:
+                    logger.info("Render section to remove experiments from a container")
+                    st.markdown("###### Remove a currently loaded experiment")
+
+                    get_experiment_names = st.multiselect(
+                        "Select the experiments to remove from the container",
+                        selected_container.get_experiment_names,
+                        key="add_experiment_to_existing",
+                    )
+                    logger.debug(f"-> Selected experiments: {get_experiment_names}")
+
+                    remove = st.button(
+                        "➖ Remove experiment",
+                        disabled=True if get_experiment_names == [] else False,
+                    )
+
+                    if remove:
+                        logger.info(
+                            f"REMOVE experiments {get_experiment_names} from container {selected_container_name}"
+                        )
+
+                        for name in get_experiment_names:
+                            exp_index = selected_container.get_index_from_name(name)
+
+                            if selected_container.reference[0] == exp_index:
+                                selected_container.reference = [0, 0]
+
+                        selected_container.remove_experiments(get_experiment_names)
+                        st.rerun()
+
+        else:
+            st.info("Cannot show edit menu, no experiment container has been selected yet.")
+
+
+# Render the plotter as a streamlit fragment so that editing the plot options reruns only the
+# plot widget and not the container editor and excel export tabs of the page
+@st.fragment
 def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_id: str) -> None:
 
+    # Import the plotting libraries only when a plot must actually be rendered
+    from plotly.subplots import make_subplots
+    from streamlit_plotly_events import plotly_events
+    from core.plot_export import render_figure
+
     # Define an annotation editor if there is a plot to which the annotations can be
     # added (plot_limits will be initialized on plot change and a rerun will be triggered)
     if plot_settings.limits["x"][0] != None:
@@ -184,7 +739,7 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
                 else:
                     annotation = st.selectbox(
                         "Select annotation",
-                        [text for text in plot_settings.annotations.keys()],
+                        list(plot_settings.annotations),
                         key=f"annotation_select_{unique_id}",
                     )
                 logger.debug(f"-> Annotation: {annotation}")
@@ -235,12 +790,15 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
                 if remove:
                     logger.info(f"REMOVE annotation: '{annotation}'")
                     del plot_settings.annotations[annotation]
-                    st.experimental_rerun()
+                    st.rerun()
 
             if apply or mode == "Edit existing":
-                if annotation is not None and annotation != "":
+                # Update the annotation only if its position changed to avoid mutating the
+                # plot settings on every rerun of the page
+                position = [x_position, y_position]
+                if annotation is not None and annotation != "" and plot_settings.annotations.get(annotation) != position:
                     logger.info(f"SET annotation '{annotation}' to x: {x_position}, y: {y_position}")
-                    plot_settings.annotations[annotation] = [x_position, y_position]
+                    plot_settings.annotations[annotation] = position
 
     # Initialize a set of columns on top of the plot section to hold buttons
     chide, cunhide, crefresh = st.columns(3)
@@ -270,7 +828,7 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
 
             plot_settings.visible_containers = st.multiselect(
                 "Select the containers to be plotted.",
-                options=[c.name for c in available_containers],
+                options=list(containers_by_name),
                 key=f"container_select_{unique_id}",
                 default=plot_settings.visible_containers,
             )
@@ -281,7 +839,7 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
             plot_settings.primary_axis_name = st.selectbox(
                 "Select the dataset for the primary Y axis",
                 Y_OPTIONS,
-                index=Y_OPTIONS.index(plot_settings.primary_axis_name) if plot_settings.primary_axis_name else 0,
+                index=Y_OPTION_INDEX[plot_settings.primary_axis_name] if plot_settings.primary_axis_name else 0,
                 on_change=clear_y_plot_limit,
                 args=[plot_settings.limits],
                 key=f"primary_y_name_{unique_id}"
@@ -289,7 +847,7 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
             )
             logger.debug(f"-> Primary Y series: {plot_settings.primary_axis_name}")
 
-            sub_Y_OPTIONS = [opt for opt in Y_OPTIONS if opt != plot_settings.primary_axis_name]
+            sub_Y_OPTIONS = SECONDARY_Y_OPTIONS[plot_settings.primary_axis_name]
             plot_settings.secondary_axis_name = st.selectbox(
                 "Select the dataset for the secondary Y axis",
                 sub_Y_OPTIONS,
@@ -303,7 +861,6 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
             )
             logger.debug(f"-> Secondary Y series: {plot_settings.secondary_axis_name}")
 
-            Y_MODES = ["Both", "Only primary", "Only secondary"]
             plot_settings.y_axis_mode = st.radio(
                 "Select which Y axis series to show",
                 Y_MODES,
@@ -312,14 +869,9 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
             )
             logger.debug(f"-> Y axis mode: {plot_settings.y_axis_mode}")
 
-            volume_is_available = True
-            for container in available_containers:
-                for name in container.get_experiment_names:
-                    experiment_id = status.get_index_of(name)
-                    experiment = status[experiment_id]
-                    if experiment.volume is None:
-                        volume_is_available = False
-                        break
+            # Use the volume and area availability evaluated once per page run (the experiments
+            # can be edited only from the other pages or tabs, always triggering a full rerun)
+            volume_is_available, area_is_available = scaling_availability
 
             plot_settings.scale_by_volume = st.checkbox(
                 "Scale values by volume",
@@ -331,15 +883,6 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
             )
             logger.debug(f"-> Scale by volume: {plot_settings.scale_by_volume}")
 
-            area_is_available = True
-            for container in available_containers:
-                for name in container.get_experiment_names:
-                    experiment_id = status.get_index_of(name)
-                    experiment = status[experiment_id]
-                    if experiment.area is None:
-                        area_is_available = False
-                        break
-
             plot_settings.scale_by_area = st.checkbox(
                 "Scale values by area",
                 value=plot_settings.scale_by_area if area_is_available else False,
@@ -353,18 +896,17 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
         with st.expander("Graph options"):
             st.markdown("###### Graph options")
 
-            available_MARKERS = [m for m in MARKERS.keys()]
             plot_settings.primary_axis_marker = st.selectbox(
                 "Select primary Y axis markers",
-                available_MARKERS,
-                index=available_MARKERS.index(plot_settings.primary_axis_marker)
+                MARKER_KEYS,
+                index=MARKER_INDEX[plot_settings.primary_axis_marker]
                 if plot_settings.primary_axis_marker
                 else 0,
                 key=f"primary_marker_{unique_id}",
             )
             logger.debug(f"-> Primary axis marker: {plot_settings.primary_axis_marker}")
 
-            available_MARKERS = [m for m in MARKERS.keys() if m != plot_settings.primary_axis_marker]
+            available_MARKERS = SECONDARY_MARKER_KEYS[plot_settings.primary_axis_marker]
             plot_settings.secondary_axis_marker = st.selectbox(
                 "Select secondary Y axis markers",
                 available_MARKERS,
@@ -393,6 +935,30 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
             )
             logger.debug(f"-> Marker with border: {plot_settings.marker_with_border}")
 
+            plot_settings.webgl = st.checkbox(
+                "High-performance rendering",
+                value=plot_settings.webgl,
+                help="Render the plot using WebGL (recommended for large datasets)",
+                key=f"webgl_{unique_id}",
+            )
+            logger.debug(f"-> WebGL rendering: {plot_settings.webgl}")
+
+            plot_settings.downsample = st.checkbox(
+                "Downsample for speed",
+                value=plot_settings.downsample,
+                help=f"Limit each container series to {MAX_TRACE_POINTS} points",
+                key=f"downsample_{unique_id}",
+            )
+            logger.debug(f"-> Downsampling: {plot_settings.downsample}")
+
+            plot_settings.point_selection = st.checkbox(
+                "Enable point selection",
+                value=plot_settings.point_selection,
+                help="Allow the selection of the cycles to hide (slower on large plots)",
+                key=f"point_selection_{unique_id}",
+            )
+            logger.debug(f"-> Point selection: {plot_settings.point_selection}")
+
             options = []
             if plot_settings.y_axis_mode == "Only primary":
                 options = ["Primary", "None"]
@@ -411,6 +977,16 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
             )
             logger.debug(f"-> Grid mode: {plot_settings.which_grid}")
 
+            hover_options = list(HOVER_MODES)
+            plot_settings.hovermode = st.selectbox(
+                "Hover mode",
+                hover_options,
+                index=hover_options.index(plot_settings.hovermode),
+                help="Use 'closest' only for small datasets, it is slow on dense plots",
+                key=f"hovermode_{unique_id}",
+            )
+            logger.debug(f"-> Hover mode: {plot_settings.hovermode}")
+
             plot_settings.font_size = int(
                 st.number_input(
                     "Label/tick font size",
@@ -443,138 +1019,107 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
             )
             logger.debug(f"-> Plot height: {plot_settings.height}")
 
-    with col1:
-
-        logger.info("Entering plot section")
+        # Reserve the section of the y-range editor, rendered after the plot once the ranges are
+        # known, and set the export options before the plot so that they can be passed to the
+        # plot toolbar
+        y_range_section = st.container()
 
-        # Create a figure object with the secondary y-axis option enabled
-        fig = make_subplots(specs=[[{"secondary_y": True}]])
+        with st.expander("Export"):
+            st.markdown("###### Export")
 
-        # Iterate over each container
-        for container in available_containers:
+            available_formats = ["png", "jpeg", "svg", "pdf"]
+            plot_settings.format = st.selectbox(
+                "Select the format of the file",
+                available_formats,
+                index=available_formats.index(plot_settings.format) if plot_settings.format else 0,
+                key=f"format_export_{unique_id}",
+            )
+            logger.debug(f"-> Export format: {plot_settings.format}")
 
-            logger.info(f"Plotting container {container.name}")
+            plot_settings.width = int(
+                st.number_input(
+                    "Plot width",
+                    min_value=10,
+                    max_value=4000,
+                    value=plot_settings.width,
+                    key=f"plot_width_{unique_id}",
+                )
+            )
+            logger.debug(f"-> Export width: {plot_settings.width}")
 
-            offset = 0
-            experiment: Experiment
+            export_section = st.container()
 
-            # Iterate over each cell_cycling object in the container
-            for cycling_index, experiment in enumerate(container):
+    # The images are exported by the plot toolbar in the browser whenever the format is supported
+    # by plotly.js and the figure is rendered by the native plotly chart
+    browser_export = not plot_settings.point_selection and plot_settings.format in ["png", "jpeg", "svg"]
 
-                if cycling_index != 0:
-                    offset += container.max_cycles_numbers[cycling_index - 1] + 1
+    with col1:
 
-                cycle_index = [n + offset for n in experiment.cellcycling.numbers]
+        logger.info("Entering plot section")
 
-                primary_label, primary_axis = get_data_series(
-                    plot_settings.primary_axis_name,
-                    cycling_index,
-                    container,
-                    scale_by_volume=plot_settings.scale_by_volume,
-                    scale_by_area=plot_settings.scale_by_area,
-                )
-                secondary_label, secondary_axis = get_data_series(
-                    plot_settings.secondary_axis_name,
-                    cycling_index,
-                    container,
-                    scale_by_volume=plot_settings.scale_by_volume,
-                    scale_by_area=plot_settings.scale_by_area,
-                )
+        # Create a figure object with the secondary y-axis option enabled
+        fig = make_subplots(specs=[[{"secondary_y": True}]])
 
-                primary_marker = MARKERS[plot_settings.primary_axis_marker]
-                secondary_marker = MARKERS[plot_settings.secondary_axis_marker]
-
-                if container.name in plot_settings.visible_containers:
-                
-                    if plot_settings.y_axis_mode != "Only secondary":
-                        fig.add_trace(
-                            go.Scatter(
-                                x=cycle_index,
-                                y=primary_axis,
-                                name=container.name,
-                                mode="markers",
-                                marker_symbol=primary_marker,
-                                marker=dict(
-                                    size=plot_settings.marker_size,
-                                    line=dict(width=1, color="DarkSlateGrey") if plot_settings.marker_with_border else None,
-                                ),
-                                line=dict(color=container.hex_color),
-                                showlegend=True if cycling_index == 0 else False,
-                            ),
-                            secondary_y=False,
-                        )
+        # Fetch the traces and the axis labels of the plot
+        traces, secondary_ys, primary_label, secondary_label = get_cellcycling_traces(plot_settings, unique_id)
 
-                    if plot_settings.y_axis_mode != "Only primary":
-                        fig.add_trace(
-                            go.Scatter(
-                                x=cycle_index,
-                                y=secondary_axis,
-                                name=container.name,
-                                mode="markers",
-                                marker_symbol=secondary_marker,
-                                marker=dict(
-                                    size=plot_settings.marker_size,
-                                    line=dict(width=1, color="DarkSlateGrey") if plot_settings.marker_with_border else None,
-                                ),
-                                line=dict(color=container.hex_color),
-                                showlegend=True
-                                if plot_settings.y_axis_mode == "Only secondary" and cycling_index == 0
-                                else False,
-                            ),
-                            secondary_y=True,
-                        )
+        show_primary = plot_settings.y_axis_mode != "Only secondary"
+        show_secondary = plot_settings.y_axis_mode != "Only primary"
 
-                else:
-                    logger.debug(f"-> Skipping hidden container {container.name}")
+        fig.add_traces(traces, secondary_ys=secondary_ys)
 
-        if plot_settings.annotations != {}:
+        # Apply the marker style to the traces so that changing it does not require the traces
+        # to be rebuilt
+        fig.update_traces(
+            marker_size=plot_settings.marker_size,
+            marker_line=dict(width=1, color="DarkSlateGrey") if plot_settings.marker_with_border else None,
+        )
+        fig.update_traces(marker_symbol=MARKERS[plot_settings.primary_axis_marker], secondary_y=False)
+        fig.update_traces(marker_symbol=MARKERS[plot_settings.secondary_axis_marker], secondary_y=True)
 
-            for text, position in plot_settings.annotations.items():
-                fig.add_annotation(
+        # Apply proper formatting to the x and y axes, to the legend and to the plot background
+        # and add the user defined annotations with a single layout update. The uirevision keeps
+        # the client state (zoom, legend selection) across reruns while the y axes revisions
+        # follow the user defined ranges so that editing them always updates the plot
+        fig.update_layout(
+            annotations=[
+                dict(
                     x=position[0],
                     y=position[1],
                     text=text,
-                    font_size=plot_settings.annotation_size,
-                    font_color=plot_settings.annotation_color,
+                    font=dict(size=plot_settings.annotation_size, color=plot_settings.annotation_color),
                     showarrow=False,
                 )
-
-        # Apply proper formatting to the x and y_a axis
-        fig.update_xaxes(
-            title_text="Cycle number",
-            showline=True,
-            linecolor="black",
-            gridwidth=1,
-            gridcolor="#DDDDDD",
-            title_font={"size": plot_settings.axis_font_size},
-        )
-
-        fig.update_yaxes(
-            title_text=f"{plot_settings.primary_axis_marker}  {primary_label}",
-            # color=primary_axis_color,
-            secondary_y=False,
-            range=plot_settings.limits["y"],
-            showline=True,
-            linecolor="black",
-            gridwidth=1,
-            gridcolor="#DDDDDD" if plot_settings.which_grid == "Primary" else None,
-            title_font={"size": plot_settings.axis_font_size},
-        )
-
-        fig.update_yaxes(
-            title_text=f"{plot_settings.secondary_axis_marker}  {secondary_label}",
-            # color=secondary_axis_color,
-            secondary_y=True,
-            range=plot_settings.limits["y2"],
-            showline=True,
-            linecolor="black",
-            gridwidth=1,
-            gridcolor="#DDDDDD" if plot_settings.which_grid == "Secondary" else None,
-            title_font={"size": plot_settings.axis_font_size},
-        )
-
-        # Apply proper formatting to legend and plot background
-        fig.update_layout(
+                for text, position in plot_settings.annotations.items()
+            ],
+            xaxis=dict(
+                title_text="Cycle number",
+                showline=True,
+                linecolor="black",
+                gridwidth=1,
+                gridcolor="#DDDDDD",
+                title_font={"size": plot_settings.axis_font_size},
+            ),
+            yaxis=dict(
+                title_text=f"{plot_settings.primary_axis_marker}  {primary_label}" if show_primary else None,
+                range=plot_settings.limits["y"],
+                uirevision=str(plot_settings.limits["y"]),
+                showline=True,
+                linecolor="black",
+                gridwidth=1,
+                gridcolor="#DDDDDD" if plot_settings.which_grid == "Primary" else None,
+                title_font={"size": plot_settings.axis_font_size},
+            ),
+            yaxis2=dict(
+                title_text=f"{plot_settings.secondary_axis_marker}  {secondary_label}" if show_secondary else None,
+                range=plot_settings.limits["y2"],
+                uirevision=str(plot_settings.limits["y2"]),
+                showline=True,
+                linecolor="black",
+                gridwidth=1,
+                gridcolor="#DDDDDD" if plot_settings.which_grid == "Secondary" else None,
+                title_font={"size": plot_settings.axis_font_size},
+            ),
             font=dict(size=plot_settings.font_size),
             legend=dict(
                 orientation="h",
@@ -584,22 +1129,73 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
                 x=0.5,
             ),
             plot_bgcolor="#FFFFFF",
+            hovermode=HOVER_MODES[plot_settings.hovermode],
+            uirevision=f"cellcycling_{unique_id}",
         )
 
-        # Use the plotly event widget to allow for interactive selection of points
-        # on the plot
-        selected_points = plotly_events(
-            fig,
-            click_event=False,
-            select_event=True,
-            override_height=plot_settings.height,
-            key=f"plotly_events_{unique_id}",
+        # Use the plotly event widget to allow for interactive selection of points on the plot
+        # only if requested by the user. The widget serializes the whole figure on every rerun
+        # so, when no selection is needed, the figure is rendered by the native plotly chart
+        if plot_settings.point_selection:
+            selected_points = plotly_events(
+                fig,
+                click_event=False,
+                select_event=True,
+                override_height=plot_settings.height,
+                key=f"plotly_events_{unique_id}",
+            )
+        else:
+            fig.update_layout(height=plot_settings.height)
+            st.plotly_chart(
+                fig,
+                use_container_width=True,
+                theme=None,
+                key=f"plotly_chart_{unique_id}",
+                config={
+                    "toImageButtonOptions": {
+                        "format": plot_settings.format if browser_export else "png",
+                        "filename": "cycle_plot",
+                        "width": plot_settings.width,
+                        "height": plot_settings.height,
+                    }
+                },
+            )
+            selected_points = []
+
+        # Get the figure data to get the plot limits. The resolved axis ranges depend only on
+        # the traces, on the marker size (used to pad the ranges) and on the user defined y
+        # ranges, so the figure is resolved again, and its ranges converted, only when one of
+        # them changes
+        figure_ranges_key = (
+            tuple(plot_settings.limits["y"]),
+            tuple(plot_settings.limits["y2"]),
+            plot_settings.marker_size,
         )
+        stored_figure_ranges = st.session_state.get(f"Cellcycling_figure_ranges_{unique_id}")
+        if (
+            stored_figure_ranges is not None
+            and stored_figure_ranges[0] is traces
+            and stored_figure_ranges[1] == figure_ranges_key
+        ):
+            xrange, yrange, y2range = stored_figure_ranges[2]
+        else:
+            figure_layout = fig.full_figure_for_development(warn=False).layout
+
+            # Convert the resolved ranges to lists of floats accessing each axis only once
+            xr, yr = figure_layout.xaxis.range, figure_layout.yaxis.range
+            y2r = figure_layout.yaxis2.range if hasattr(figure_layout, "yaxis2") else None
 
-        # Get the figure data to localize the selected points and to get the plot limits
-        figure_data = fig.full_figure_for_development(warn=False)
+            xrange = None if xr is None else [float(xr[0]), float(xr[1])]
+            yrange = None if yr is None else [float(yr[0]), float(yr[1])]
+            y2range = None if y2r is None else [float(y2r[0]), float(y2r[1])]
+
+            st.session_state[f"Cellcycling_figure_ranges_{unique_id}"] = (
+                traces,
+                figure_ranges_key,
+                (xrange, yrange, y2range),
+            )
 
-        if selected_points != [] and selected_points is not None:
+        if selected_points:
             selected_cycles = ", ".join([str(point["x"]) for point in selected_points])
             st.success(f"Currently selected points: {selected_cycles}")
             logger.info(f"SELECTED points: {selected_points}")
@@ -608,40 +1204,38 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
         with chide:
             hide = st.button(
                 "🚫 Hide cycles",
-                disabled=False if selected_points != [] and selected_points is not None else True,
+                disabled=not selected_points,
                 key=f"hide_{unique_id}",
             )
 
             if hide:
                 logger.info("HIDING selected points")
-                trace_list = [obj["name"] for obj in figure_data["data"]]
-
+                # Group the selected cycles by container to hide them with a single update. The
+                # curve number of each point is the index of the trace, named after the container
+                hidden_cycles: Dict[str, List[int]] = {}
                 for selected_point in selected_points:
-                    container_name = trace_list[selected_point["curveNumber"]]
-                    container_idx = [obj.name for obj in available_containers].index(container_name)
-                    available_containers[container_idx].hide_cycle(selected_point["x"])
+                    container_name = traces[selected_point["curveNumber"]]["name"]
+                    hidden_cycles.setdefault(container_name, []).append(selected_point["x"])
+
+                for container_name, cycles in hidden_cycles.items():
+                    containers_by_name[container_name].hide_cycles(cycles)
 
-                st.experimental_rerun()
+                st.rerun()
 
         # Render a referesh button to manually trigger a rerun
         with crefresh:
             refresh = st.button("♻ Refresh", key=f"refresh_{unique_id}")
 
             if refresh:
-                st.experimental_rerun()
-
-        # Evaluate the current plot limits
-        xrange = None if figure_data.layout.xaxis.range is None else [float(x) for x in figure_data.layout.xaxis.range]
-        yrange = None if figure_data.layout.yaxis.range is None else [float(y) for y in figure_data.layout.yaxis.range]
-
-        y2range = [float(y) for y in figure_data.layout.yaxis2.range] if hasattr(figure_data.layout, "yaxis2") else None
+                st.rerun()
 
         # Update the axis ranges if a change is detected. Exclude the axis not currently
-        # plotted to avoid continuous rerun of the page
+        # plotted and ignore the floating point noise of the ranges to avoid continuous rerun
+        # of the page
         if (
-            plot_settings.limits["x"] != xrange
-            or (plot_settings.limits["y"] != yrange and plot_settings.y_axis_mode != "Only secondary")
-            or (plot_settings.limits["y2"] != y2range and plot_settings.y_axis_mode != "Only primary")
+            limits_changed(plot_settings.limits["x"], xrange)
+            or (limits_changed(plot_settings.limits["y"], yrange) and plot_settings.y_axis_mode != "Only secondary")
+            or (limits_changed(plot_settings.limits["y2"], y2range) and plot_settings.y_axis_mode != "Only primary")
         ):
             plot_settings.limits["x"] = xrange
             plot_settings.limits["y"] = [0.0, yrange[1]] if yrange is not None else plot_settings.limits["y"]
@@ -653,19 +1247,18 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
             logger.debug(
                 f"-> Limits: x={plot_settings.limits['x']}, y1={plot_settings.limits['y']}, y2={plot_settings.limits['y2']}"
             )
-            st.experimental_rerun()
+            st.rerun()
 
     with col2:
 
         logger.info("Re-Entering plot options menu to set y-range and export")
 
-        with st.expander("Y axis range"):
-
-            figure_data = fig.full_figure_for_development(warn=False)
+        with y_range_section, st.expander("Y axis range"):
 
+            # The current ranges are read from the plot limits, already synced with the figure
+            # data computed in the plot section
             if plot_settings.y_axis_mode != "Only secondary":
                 st.markdown("###### primary Y-axis range")
-                # y1_range = figure_data.layout.yaxis.range
                 y1_max = float(
                     st.number_input(
                         "Maximum y-value",
@@ -689,11 +1282,10 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
                 if plot_settings.limits["y"][0] != y1_min or plot_settings.limits["y"][1] != y1_max:
                     plot_settings.limits["y"] = [y1_min, y1_max]
                     logger.info(f"Setting Y limits to {plot_settings.limits['y']}")
-                    st.experimental_rerun()
+                    st.rerun()
 
             if plot_settings.y_axis_mode != "Only primary":
                 st.markdown("###### secondary Y-axis range")
-                # y2_range = figure_data.layout.yaxis2.range
                 y2_max = float(
                     st.number_input(
                         "Maximum y-value",
@@ -717,58 +1309,29 @@ def cell_cycling_plotter_widget(plot_settings: CellcyclingPlotSettings, unique_i
                 if plot_settings.limits["y2"][0] != y2_min or plot_settings.limits["y2"][1] != y2_max:
                     plot_settings.limits["y2"] = [y2_min, y2_max]
                     logger.info(f"Setting Y2 limits to {plot_settings.limits['y2']}")
-                    st.experimental_rerun()
+                    st.rerun()
 
-        # Add an export option
-        with st.expander("Export"):
-            st.markdown("###### Export")
-
-            available_formats = ["png", "jpeg", "svg", "pdf"]
-            plot_settings.format = st.selectbox(
-                "Select the format of the file",
-                available_formats,
-                index=available_formats.index(plot_settings.format) if plot_settings.format else 0,
-                key=f"format_export_{unique_id}",
-            )
-            logger.debug(f"-> Export format: {plot_settings.format}")
+        # Render the image on the server, serializing the figure only when the download is
+        # requested, if the export cannot be carried out by the plot toolbar
+        with export_section:
+            if browser_export:
+                st.info("Download the plot using the 📷 button of the plot toolbar")
 
-            plot_settings.width = int(
-                st.number_input(
-                    "Plot width",
-                    min_value=10,
-                    max_value=4000,
-                    value=plot_settings.width,
-                    key=f"plot_width_{unique_id}",
+            else:
+                st.download_button(
+                    "Download plot",
+                    data=partial(
+                        render_figure,
+                        fig,
+                        plot_settings.format,
+                        plot_settings.width,
+                        plot_settings.height,
+                    ),
+                    file_name=f"cycle_plot.{plot_settings.format}",
+                    on_click=lambda msg: logger.info(msg),
+                    args=[f"DOWNLOAD cycle_plot.{plot_settings.format}"],
+                    key=f"download_{unique_id}",
                 )
-            )
-            logger.debug(f"-> Export width: {plot_settings.width}")
-
-            # Redefine layout options to account for user selected width
-            fig.update_layout(
-                height=plot_settings.height,
-                width=plot_settings.width,
-                font=dict(size=plot_settings.font_size),
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.0,
-                    xanchor="center",
-                    x=0.5,
-                ),
-                plot_bgcolor="#FFFFFF",
-            )
-
-            st.download_button(
-                "Download plot",
-                data=fig.to_image(format=plot_settings.format),
-                file_name=f"cycle_plot.{plot_settings.format}",
-                on_click=lambda msg: logger.info(msg),
-                args=[f"DOWNLOAD cycle_plot.{plot_settings.format}"],
-                key=f"download_{unique_id}",
-            )
-
-            logger.info("FORCING RERUN AT END OF PAGE")
-            force_update_once()
 
 
 try:
@@ -798,6 +1361,21 @@ try:
 
     if enable:
 
+        # Check if volume and area are available for all the experiments in the containers
+        experiments_by_name = {experiment.name: experiment for experiment in status}
+        scaling_availability = (
+            not any(
+                experiments_by_name[name].volume is None
+                for container in available_containers
+                for name in container.get_experiment_names
+            ),
+            not any(
+                experiments_by_name[name].area is None
+                for container in available_containers
+                for name in container.get_experiment_names
+            ),
+        )
+
         # Define a two tab page with a container editor and a plotter
         container_tab, plot_tab, csv_tab = st.tabs(["Container editor", "Container plotter", "Excel export"])
 
@@ -817,39 +1395,41 @@ try:
                 )
 
                 # Create a setup section in which the user can create a new experiment given a
-                # name, a list of experiments to load and a custom color
-                col1, col2, col3 = st.columns([2, 2, 1])
+                # name, a list of experiments to load and a custom color. The widgets are grouped
+                # in a form so that the page is rerun only when the container is created
+                with st.form("new_container_form"):
 
-                with col1:
-                    container_name = st.text_input("Insert the name of the container", value="")
-                    logger.debug(f"-> Container name: {container_name}")
+                    col1, col2, col3 = st.columns([2, 2, 1])
 
-                with col2:
-                    experiments_names = st.multiselect(
-                        "Select the experiments to add to the container",
-                        status.get_experiment_names(),
-                        key="add_experiment_to_new",
-                    )
-                    logger.debug(f"-> Experiments names: {experiments_names}")
+                    with col1:
+                        container_name = st.text_input("Insert the name of the container", value="")
+                        logger.debug(f"-> Container name: {container_name}")
 
-                with col3:
-                    container_color = st.color_picker(
-                        "Select the container color",
-                        value=get_plotly_color(len(available_containers)),
-                    )
-                    logger.debug(f"-> Container color: {container_color}")
+                    with col2:
+                        experiments_names = st.multiselect(
+                            "Select the experiments to add to the container",
+                            list(experiments_by_name),
+                            key="add_experiment_to_new",
+                        )
+                        logger.debug(f"-> Experiments names: {experiments_names}")
 
-                apply = st.button(
-                    "➕ Create container",
-                    key="create container",
-                    disabled=True if container_name == "" else False,
-                )
+                    with col3:
+                        container_color = st.color_picker(
+                            "Select the container color",
+                            value=get_plotly_color(len(available_containers)),
+                        )
+                        logger.debug(f"-> Container color: {container_color}")
+
+                    apply = st.form_submit_button("➕ Create container")
 
-                if apply:
+                if apply and container_name == "":
+                    st.warning("Please enter a name for the container.")
+
+                elif apply:
 
                     logger.info("PRESSED apply button")
 
-                    if container_name not in [obj.name for obj in available_containers]:
+                    if container_name not in containers_by_name:
 
                         logger.info(
                             f"Creating a new container named {container_name} (color {container_color}) containing experiment {experiments_names}"
@@ -859,11 +1439,10 @@ try:
 
                         if experiments_names != []:
                             for name in experiments_names:
-                                id = status.get_index_of(name)
-                                new_container.add_experiment(status[id])
+                                new_container.add_experiment(experiments_by_name[name])
 
                         available_containers.append(new_container)
-                        st.experimental_rerun()
+                        st.rerun()
 
                     else:
                         st.error(f"ERROR: the name '{container_name}' is already taken.")
@@ -872,156 +1451,13 @@ try:
             # If there are already loaded container allow the user to edit or delete them
             if available_containers != []:
 
-                with st.expander("Edit experiment container", expanded=False):
-                    logger.info("Entering container editor")
-
-                    st.markdown("#### Edit an existing container")
-
-                    col1, col2 = st.columns(2)
-
-                    with col1:
-                        selected_container_name = st.selectbox(
-                            "Select the container to edit",
-                            [obj.name for obj in available_containers],
-                        )
-                        logger.debug(f"-> Selected container: {selected_container_name}")
-
-                        delete = st.button("❌ Delete the container")
-
-                        if delete:
-                            logger.info(f"REMOVING container '{selected_container_name}'")
-                            idx = [obj.name for obj in available_containers].index(selected_container_name)
-                            del available_containers[idx]
-                            st.experimental_rerun()
-
-                        st.markdown("---")
-
-                        operation_mode = st.radio(
-                            "Select the operation mode",
-                            ["Change reference", "Add experiment", "Remove experiment"],
-                        )
-
-                    if selected_container_name != None:
-
-                        container_idx: int = [container.name for container in available_containers].index(
-                            selected_container_name
-                        )
-
-                        selected_container: ExperimentContainer = available_containers[container_idx]
-
-                        with col2:
-
-                            if operation_mode == "Change reference":
-
-                                logger.info("Render section to add change reference cycle of the container")
-
-                                if len(selected_container) != 0:
-
-                                    st.markdown("###### Change container reference")
-
-                                    current_reference = selected_container.reference
-                                    exp_index = int(
-                                        st.number_input(
-                                            "Select experiment index",
-                                            value=current_reference[0],
-                                            min_value=0,
-                                            max_value=len(selected_container) - 1,
-                                            step=1,
-                                            disabled=True if len(selected_container) == 0 else False,
-                                        )
-                                    )
-
-                                    cycle_index = int(
-                                        st.number_input(
-                                            "Select cycle index",
-                                            value=current_reference[1],
-                                            min_value=0,
-                                            max_value=len(selected_container[exp_index]._cycles) - 1,
-                                            step=1,
-                                            disabled=True if len(selected_container) == 0 else False,
-                                        )
-                                    )
-
-                                    apply_ref = st.button("🗒️ Apply new reference")
-
-                                    if apply_ref:
-                                        selected_container.reference = [exp_index, cycle_index]
-                                        st.experimental_rerun()
-
-                                else:
-                                    st.info(
-                                        "**INFO:** Cannot change reference in an empty conatiner. Please add experiments using the `Add experiment` page."
-                                    )
-
-                                # selected_container.
-
-                            elif operation_mode == "Add experiment":
-                                logger.info("Render section to add new experiment to container")
-                                st.markdown("###### Add another experiment")
-
-                                valid_exp_names = [
-                                    name
-                                    for name in status.get_experiment_names()
-                                    if name not in selected_container.get_experiment_names
-                                ]
-                                experiment_name = st.selectbox(
-                                    "Select the experiments to add to the container",
-                                    valid_exp_names,
-                                )
-                                logger.debug(f"-> Selected experiment: '{experiment_name}'")
-
-                                add = st.button(
-                                    "➕ Add experiment",
-                                    disabled=True if experiment_name is None else False,
-                                )
-
-                                if add:
-                                    logger.info(
-                                        f"ADD experiment {experiment_name} to container {selected_container_name}"
-                                    )
-                                    id = status.get_index_of(experiment_name)
-                                    selected_container.add_experiment(status[id])
-                                    st.experimental_rerun()
-
-                            else:
-                                logger.info("Render section to remove experiments from a container")
-                                st.markdown("###### Remove a currently loaded experiment")
-
-                                get_experiment_names = st.multiselect(
-                                    "Select the experiments to remove from the container",
-                                    [name for name in selected_container.get_experiment_names],
-                                    key="add_experiment_to_existing",
-                                )
-                                logger.debug(f"-> Selected experiments: {get_experiment_names}")
-
-                                remove = st.button(
-                                    "➖ Remove experiment",
-                                    disabled=True if get_experiment_names == [] else False,
-                                )
-
-                                if remove:
-                                    logger.info(
-                                        f"REMOVE experiments {get_experiment_names} from container {selected_container_name}"
-                                    )
-
-                                    for name in get_experiment_names:
-                                        exp_index = selected_container.get_index_from_name(name)
-
-                                        if selected_container.reference[0] == exp_index:
-                                            selected_container.reference = [0, 0]
-
-                                    for name in get_experiment_names:
-                                        selected_container.remove_experiment(name)
-                                    st.experimental_rerun()
-
-                    else:
-                        st.info("Cannot show edit menu, no experiment container has been selected yet.")
+                container_editor_widget()
 
         # Define a plot tab to hold the plotted data
         with plot_tab:
 
             # Visualize something only if there are available containers
-            if available_containers != [] and any([len(c) != 0 for c in available_containers]):
+            if any(len(c) != 0 for c in available_containers):
 
                 logger.info("Entering Container plotter tab")
 
@@ -1044,7 +1480,7 @@ try:
                 if add:
                     if plot_name not in plot_settings_dict:
                         default_settings = CellcyclingPlotSettings()
-                        default_settings.visible_containers = [c.name for c in available_containers]
+                        default_settings.visible_containers = list(containers_by_name)
                         plot_settings_dict[plot_name] = default_settings
                     else:
                         st.warning(f"WARNING: The name {plot_name} is already in use")
@@ -1053,7 +1489,7 @@ try:
 
                 if plot_settings_dict != {}:
 
-                    plot_names: List[str] = [name for name in plot_settings_dict.keys()]
+                    plot_names: List[str] = list(plot_settings_dict)
 
                     st.markdown("###### Plot selector")
 
@@ -1071,7 +1507,7 @@ try:
                     if remove:
                         logger.info(f"REMOVED plot name: {selected_plot})")
                         del plot_settings_dict[selected_plot]
-                        st.experimental_rerun()
+                        st.rerun()
 
                     st.markdown("---")
 
@@ -1080,6 +1516,11 @@ try:
                     logger.info(f"RENDERING cellcycling plot {idx} (title: {selected_plot})")
                     cell_cycling_plotter_widget(plot_settings_dict[selected_plot], idx)
 
+                    # Force the page update outside the plotter fragment so that the plot options
+                    # changes rerun only the fragment and not the whole page
+                    logger.info("FORCING RERUN AT END OF PAGE")
+                    force_update_once()
+
                 else:
                     st.info("Please create a cell-cycling plot")
 
@@ -1110,19 +1551,15 @@ try:
                     st.markdown("##### Container selector")
                     container_name: str = st.selectbox(
                         "Select the container to export",
-                        options=[c.name for c in available_containers],
+                        options=list(containers_by_name),
                         key="csv_container_selector",
                     )
 
                     logger.info(f"Selected container {container_name}")
 
-                    selected_container: ExperimentContainer = None
-                    for container in available_containers:
-                        if container.name == container_name:
-                            selected_container = container
-                            break
+                    selected_container: ExperimentContainer = containers_by_name[container_name]
 
-                    logger.debug(f"-> Selected container: {container.name}")
+                    logger.debug(f"-> Selected container: {selected_container.name}")
 
                 if len(selected_container) != 0:
 
@@ -1131,11 +1568,9 @@ try:
                         st.markdown("##### Data options")
                         st.write("")
 
-                        volume_is_available = True
-                        for experiment in selected_container:
-                            if experiment.volume is None:
-                                volume_is_available = False
-                                break
+                        volume_is_available = not any(
+                            experiment.volume is None for experiment in selected_container
+                        )
 
                         scale_csv_by_volume = st.checkbox(
                             "Scale by volume",
@@ -1146,11 +1581,9 @@ try:
 
                         logger.debug(f"-> Scale csv by volume: {scale_csv_by_volume}")
 
-                        area_is_available = True
-                        for experiment in selected_container:
-                            if experiment.area is None:
-                                area_is_available = False
-                                break
+                        area_is_available = not any(
+                            experiment.area is None for experiment in selected_container
+                        )
 
                         scale_csv_by_area = st.checkbox(
                             "Scale by area",
@@ -1171,70 +1604,46 @@ try:
 
                         logger.debug(f"-> Selected series to be exported in the csv: {selected_series}")
 
-                    # Define the csv data in string format
-                    csv_data = ""
-
-                    # Write the header for each experiment
-                    for experiment in container:
-                        for _ in selected_series:
-                            csv_data += f"{experiment.name},"
-
-                    csv_data = csv_data[:-1]
-                    csv_data += "\n"
-
-                    for _ in container:
-                        for label in selected_series:
-                            # Extract the proper header from the helper function
-                            header, _ = get_data_series(
+                    # Extract the proper header of each series from the helper function
+                    headers = [
+                        get_cached_data_series(
+                            label,
+                            0,
+                            selected_container,
+                            scale_by_volume=scale_csv_by_volume,
+                            scale_by_area=scale_csv_by_area,
+                        )[0]
+                        for label in selected_series
+                    ]
+
+                    # Extract, once for each experiment, the number of cycles and the selected
+                    # data series to be written in the table
+                    number_of_cycles = [len(experiment.cycles) for experiment in selected_container]
+                    series_values = [
+                        [
+                            get_cached_data_series(
                                 label,
-                                0,
+                                eidx,
                                 selected_container,
                                 scale_by_volume=scale_csv_by_volume,
                                 scale_by_area=scale_csv_by_area,
-                            )
-                            csv_data += f"{header},"
-
-                    csv_data = csv_data[:-1]
-                    csv_data += "\n"
-
-                    # Write the data associated to each experiment
-                    cycle_index = 0
-
-                    while cycle_index < max([len(exp.cycles) for exp in selected_container]):
-                        for eidx, experiment in enumerate(selected_container):
-                            for label in selected_series:
-                                if len(experiment.cycles) > cycle_index:
-                                    series = get_data_series(
-                                        label,
-                                        eidx,
-                                        selected_container,
-                                        scale_by_volume=scale_csv_by_volume,
-                                        scale_by_area=scale_csv_by_area,
-                                    )
-                                    csv_data += f"{series[1][cycle_index]},"
-                                else:
-                                    csv_data += ","
-
-                        csv_data = csv_data[:-1]
-                        csv_data += "\n"
-                        cycle_index += 1
-
-                    # Convert the csv file into xlsx format
-                    xls_bytestream = BytesIO()
-                    workbook = openpyxl.Workbook()
-                    sheet = workbook.active
-                    for r, row in enumerate(csv_data.split("\n")):
-                        if r < 2:
-                            sheet.append(row.split(","))
-                        else:
-                            sheet.append([float(x) if x != "" and x != "None" else x for x in row.split(",")])
-                    workbook.save(xls_bytestream)
-
-                    # Define a download button to convert the csv_data object to file
+                            )[1]
+                            for label in selected_series
+                        ]
+                        for eidx in range(len(selected_container))
+                    ]
+
+                    # Define a download button building the xlsx file only when requested
                     with cselect:
                         st.download_button(
                             label="📥 Download xlsx",
-                            data=xls_bytestream,
+                            data=partial(
+                                build_xlsx_export,
+                                selected_container.get_experiment_names,
+                                headers,
+                                number_of_cycles,
+                                series_values,
+                            ),
                             file_name=f"{container_name}.xlsx",
                             mime="xlsx",
                             disabled=True if len(selected_container) == 0 else False,
@@ -189,7 +189,7 @@ try:
                             )
 
                         # Rerun the page to force update
-                        st.experimental_rerun()
+                        st.rerun()
 
         created_experiment = st.session_state["UploadConfirmation"][0]
         skipped_files = st.session_state["UploadConfirmation"][1]
@@ -269,7 +269,7 @@ try:
                     status.remove_experiment(status.get_index_of(experiment.name))
                     if st.session_state["SelectedExperimentName"] == experiment.name:
                         st.session_state["SelectedExperimentName"] = None
-                    st.experimental_rerun()
+                    st.rerun()
 
             st.markdown("""---""")
 
@@ -288,7 +288,7 @@ try:
                     experiment.name = new_experiment_name
                     st.session_state["SelectedExperimentName"] = new_experiment_name
                     update_experiment_name(name, new_experiment_name)
-                    st.experimental_rerun()
+                    st.rerun()
 
                 # Allow the user to define the experiment volume
                 st.markdown("##### Electrolite volume:")
@@ -311,7 +311,7 @@ try:
                         if volume != experiment.volume:
                             logger.info(f"SET volume to {volume}L")
                             experiment.volume = volume
-                            st.experimental_rerun()
+                            st.rerun()
 
                 # Allow the user to define the experiment electrode area
                 st.markdown("##### Electrode area:")
@@ -334,7 +334,7 @@ try:
                         if area != experiment.area:
                             logger.info(f"SET electrode area to {area}cm^2")
                             experiment.area = area
-                            st.experimental_rerun()
+                            st.rerun()
 
             with col2:
 
@@ -347,7 +347,7 @@ try:
                 if clean_status != experiment.clean:
                     st.info(f"SET clean option to {clean_status}")
                     experiment.clean = clean_status
-                    st.experimental_rerun()
+                    st.rerun()
 
                 # Allow the user to select a base color for the experiment to be used in the stacked-plot
                 st.markdown("##### Base color:")
@@ -359,7 +359,7 @@ try:
                 if color != current_color:
                     st.info(f"SET base color to {color}")
                     experiment.color = ColorRGB(*HEX_to_RGB(color))
-                    st.experimental_rerun()
+                    st.rerun()
 
             st.markdown("""   """)
 
@@ -415,7 +415,7 @@ try:
                     logger.info(f"DELETED files [{selection_list}]")
                     for filename in selection_list:
                         experiment.remove_file(filename)
-                    st.experimental_rerun()
+                    st.rerun()
 
             # If the .DTA files from GAMRY are loaded create a section dedicated to the process of merging/ordering of halfcycles
             if experiment.manager.instrument == "GAMRY":
@@ -589,7 +589,7 @@ try:
                         if new_ordering != experiment.ordering:
                             logger.info(f"SET new file ordering: {new_ordering}")
                             experiment.ordering = new_ordering
-                            st.experimental_rerun()
+                            st.rerun()
 
     with inspector_tab:
         logger.info("Rendering the experiment inspector tab")